@@ -0,0 +1,155 @@
+"""
+Local stand-in for a remote file server, used to count the requests and bytes
+needed to browse a file over HTTP. The server answers single byte range
+requests (multipart ranges are refused, as by many file servers) and can add a
+fixed latency to every request to mimic a distant host.
+
+Without --serve, every branch of the tree is read once through each source,
+and the number of requests, bytes sent, and the time taken are written as
+JSON:
+
+- cached: the block cached source of the browser (uproot_browser.remote)
+- uproot: the uproot HTTP source, one request per basket without multipart
+"""
+
+import argparse
+import http.server
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import uproot
+
+from uproot_browser.lazy_array import LazyColumns
+from uproot_browser.remote import CachedHTTPSource, open_url
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keeping connections alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.count_request()
+        time.sleep(self.server.latency)
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        size = os.path.getsize(path)
+        match = _RANGE.match(self.headers.get("Range", ""))
+        if "Range" in self.headers and match is None:
+            self.send_error(416, "Only single byte ranges are supported")
+            return
+        start, stop = 0, size
+        if match is not None:
+            start = int(match.group(1))
+            stop = min(int(match.group(2)) + 1 if match.group(2) else size, size)
+        with open(path, "rb") as f:
+            f.seek(start)
+            body = f.read(stop - start)
+        self.send_response(200 if match is None else 206)
+        if match is not None:
+            self.send_header("Content-Range", f"bytes {start}-{stop - 1}/{size}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count_bytes(len(body))
+
+
+class CountingServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, directory: str, latency: float = 0.0):
+        def handler(*args, **kwargs):
+            return RangeRequestHandler(*args, directory=directory, **kwargs)
+
+        super().__init__(address, handler)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.reset()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_bytes(self, n_bytes: int):
+        with self._lock:
+            self.bytes_sent += n_bytes
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+
+def serve(directory: str, port: int = 0, latency: float = 0.0) -> CountingServer:
+    """Starting the server in a background thread, port 0 picks a free port"""
+    server = CountingServer(("127.0.0.1", port), directory, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def browse(url: str, tree_path: Optional[str], handler: type) -> Dict:
+    start = time.perf_counter()
+    with open_url(url, handler=handler, array_cache=None) as f:
+        tree = f[tree_path]
+        columns = LazyColumns(tree)
+        for name in columns.fields:
+            columns[name]
+    return {"seconds": time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("file", help="File served by the stand-in server")
+    parser.add_argument("--tree-path", default="Events")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument(
+        "--serve", action="store_true", help="Only serving the file, until stopped"
+    )
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    directory, name = os.path.split(os.path.abspath(args.file))
+    server = serve(directory, args.port, args.latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}/{name}"
+    if args.serve:
+        print(f"Serving {url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print(json.dumps({"requests": server.requests, "bytes": server.bytes_sent}))
+        return
+
+    report = {"file": args.file, "latency": args.latency}
+    for label, handler in [
+        ("cached", CachedHTTPSource),
+        ("uproot", uproot.source.http.HTTPSource),
+    ]:
+        server.reset()
+        result = browse(url, args.tree_path, handler)
+        result.update(requests=server.requests, bytes=server.bytes_sent)
+        report[label] = result
+    report["file_bytes"] = os.path.getsize(args.file)
+    server.shutdown()
+
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Timing the main paths of the browser on synthetic trees. The interface is run
+headless, and each path is timed separately:
+
+- load: opening the file and tree (UprootBrowser._load_file_memory)
+- read: reading a single branch in full
+- stats: accumulating and finalizing the statistics of the branch, serially
+- stats_parallel: the same split over the worker threads, as for the plots
+- summary: the DistributionSummary text of the statistics
+- figure: DistributionFigure.update_content and rendering the plot
+- filter: narrowing the branch list while a query is typed
+
+Presets cover the scales of real analysis files, wide trees of 2,000 branches
+and long trees of 50M entries, which are timed as separate cases as a tree
+with both would be several hundred GB.
+
+Results are written as JSON, such that runs can be compared between commits.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from synthetic import BRANCH_KINDS, make_file
+
+from uproot_browser.app import UprootBrowser
+from uproot_browser.array_parse import ArraySummaryType
+from uproot_browser.streaming import accumulate_parallel
+
+_SUMMARY_METHODS = {
+    ArraySummaryType.boolean: "_boolean_summary",
+    ArraySummaryType.discrete: "_discrete_summary",
+    ArraySummaryType.continuous: "_default_summary",
+}
+
+# Cases of (entries, branches) run by each preset
+PRESETS: Dict[str, List[Tuple[int, int]]] = {
+    "small": [(10_000, 10), (10_000, 200), (100_000, 10), (100_000, 200)],
+    "wide": [(100_000, 2_000)],
+    "long": [(50_000_000, 10)],
+}
+PRESETS["full"] = PRESETS["small"] + PRESETS["wide"] + PRESETS["long"]
+
+
+def timeit(func: Callable, repeat: int) -> Dict[str, float]:
+    """Minimum and median wall time of repeated calls in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def _sample_branches(names: List[str]) -> Dict[str, str]:
+    # The first branch of each kind, jagged branches are named after collections
+    picks = {}
+    for name in names:
+        kind = "jagged" if name.startswith("Coll") else name.split("_")[0]
+        if kind in BRANCH_KINDS:
+            picks.setdefault(kind, name)
+    return picks
+
+
+def _typing_queries(name: str) -> List[str]:
+    # Every prefix of the name, as the query would be typed
+    return [name[: i + 1] for i in range(len(name))]
+
+
+def _time_branch(app: UprootBrowser, name: str, repeat: int) -> Dict:
+    timing: Dict = {}
+
+    def _read():
+        app.column_cache.clear()
+        return app.array[name]
+
+    timing["read"] = timeit(_read, repeat)
+    array = app.array[name]
+    timing["stats"] = timeit(lambda: accumulate_parallel(array).finalize(), repeat)
+    timing["stats_parallel"] = timeit(
+        lambda: accumulate_parallel(array, app.executor, app.n_workers).finalize(),
+        repeat,
+    )
+    stats = accumulate_parallel(array).finalize()
+    method = getattr(app.dist_summary, _SUMMARY_METHODS[stats.summary_type])
+    timing["summary"] = timeit(lambda: method(stats), repeat)
+    timing["summary_update"] = timeit(
+        lambda: app.dist_summary.update_content(stats), repeat
+    )
+
+    def _figure():
+        # Rendering builds the plotext canvas at the size of the widget
+        app.dist_figure.update_content(stats)
+        app.dist_figure.render()
+
+    timing["figure"] = timeit(_figure, repeat)
+    return timing
+
+
+async def run_case(path: str, repeat: int) -> Dict:
+    app = UprootBrowser(prefetch=False)
+    result: Dict = {}
+    async with app.run_test(headless=True, size=(160, 48)) as pilot:
+        result["load"] = timeit(lambda: app._load_file_memory(path, "Events"), repeat)
+        app._set_opened(app._load_file_memory(path, "Events"))
+        app._load_file_interface()
+        await pilot.pause()
+
+        branch_list = app.branch_select_list
+        names = branch_list.original_fields
+        result["index"] = timeit(lambda: branch_list._set_fields(names), repeat)
+        queries = _typing_queries(names[-1])
+        result["filter"] = timeit(
+            lambda: [
+                branch_list._set_matches(branch_list.index.match(q)) for q in queries
+            ],
+            repeat,
+        )
+        result["filter"]["keystrokes"] = len(queries)
+
+        result["branch_timings"] = {
+            f"{kind}:{name}": _time_branch(app, name, repeat)
+            for kind, name in _sample_branches(names).items()
+        }
+    return result
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--preset",
+        choices=sorted(PRESETS),
+        default="small",
+        help="Tree sizes to run, unless given by --entries and --branches",
+    )
+    parser.add_argument(
+        "--entries",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Number of entries of the synthetic trees, up to 50M",
+    )
+    parser.add_argument(
+        "--branches",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Number of branches of the synthetic trees, up to 2000",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default=os.path.join(tempfile.gettempdir(), "uproot_browser_bench"),
+        help="Directory where the synthetic files are kept between runs",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="JSON output, stdout by default"
+    )
+    args = parser.parse_args()
+
+    cases = PRESETS[args.preset]
+    if args.entries is not None or args.branches is not None:
+        # Sizes not given on the command line are taken from the preset
+        entries = args.entries or sorted({e for e, _ in cases})
+        branches = args.branches or sorted({b for _, b in cases})
+        cases = [(e, b) for e in entries for b in branches]
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "preset": args.preset,
+        "cases": [],
+    }
+    for n_entries, n_branches in cases:
+        path = make_file(
+            os.path.join(args.data_dir, f"synthetic_{n_entries}_{n_branches}.root"),
+            n_entries,
+            n_branches,
+        )
+        case = {"entries": n_entries, "branches": n_branches}
+        case.update(asyncio.run(run_case(path, args.repeat)))
+        report["cases"].append(case)
+
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
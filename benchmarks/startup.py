@@ -0,0 +1,110 @@
+"""
+Regression check of the startup time. Each measurement runs in a fresh
+interpreter, timing the import of the application module and the time until
+the first frame is drawn (headless). The check fails if the array libraries
+are imported before the first frame, or if the median times exceed the limits.
+Results are written as JSON.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Modules that should only be imported by the background workers
+HEAVY_MODULES = ["awkward", "uproot", "numpy"]
+
+_IMPORT_CHECK = """
+import json, sys, time
+start = time.perf_counter()
+import uproot_browser.app
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"import": elapsed, "heavy": heavy}}))
+"""
+
+_FRAME_CHECK = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from uproot_browser.app import UprootBrowser
+
+async def main():
+    app = UprootBrowser({file!r}, {tree!r}, summary_cache=None, prefetch=False)
+    async with app.run_test(headless=True, size=(160, 48)) as pilot:
+        first_frame = time.perf_counter() - start
+        heavy = [m for m in {heavy!r} if m in sys.modules]
+        opened = None
+        if {file!r} is not None:
+            while app.array is None and time.perf_counter() - start < 60:
+                await pilot.pause(0.01)
+            opened = time.perf_counter() - start
+    print(json.dumps({{"first_frame": first_frame, "opened": opened, "heavy": heavy}}))
+
+asyncio.run(main())
+"""
+
+
+def _run(code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("file", nargs="?", help="File opened after the first frame")
+    parser.add_argument("--tree-path", default="Events")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import", type=float, default=0.5, help="Seconds")
+    parser.add_argument("--max-first-frame", type=float, default=1.5, help="Seconds")
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    imports = [
+        _run(_IMPORT_CHECK.format(heavy=HEAVY_MODULES)) for _ in range(args.repeat)
+    ]
+    frames = [
+        _run(
+            _FRAME_CHECK.format(
+                file=args.file, tree=args.tree_path, heavy=HEAVY_MODULES
+            )
+        )
+        for _ in range(args.repeat)
+    ]
+    report = {
+        "import": statistics.median(r["import"] for r in imports),
+        "first_frame": statistics.median(r["first_frame"] for r in frames),
+        "opened": (
+            statistics.median(r["opened"] for r in frames) if args.file else None
+        ),
+        "heavy_at_import": sorted({m for r in imports for m in r["heavy"]}),
+        "heavy_at_first_frame": sorted({m for r in frames for m in r["heavy"]}),
+    }
+    failures = []
+    if report["heavy_at_import"]:
+        failures.append(f"imported at startup: {report['heavy_at_import']}")
+    if report["heavy_at_first_frame"]:
+        failures.append(
+            f"imported before the first frame: {report['heavy_at_first_frame']}"
+        )
+    if report["import"] > args.max_import:
+        failures.append(f"import took {report['import']:.3f}s")
+    if report["first_frame"] > args.max_first_frame:
+        failures.append(f"first frame took {report['first_frame']:.3f}s")
+    report["failures"] = failures
+
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
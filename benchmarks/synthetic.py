@@ -0,0 +1,92 @@
+"""
+Writing synthetic trees with the uproot writer for benchmarking. Branches cycle
+through the kinds commonly found in analysis files: flat floats, integers with
+few distinct values, booleans and jagged collections sharing a counter branch.
+"""
+
+import argparse
+import os
+from typing import Dict
+
+import awkward
+import numpy
+import uproot
+
+BRANCH_KINDS = ["float", "int", "bool", "jagged"]
+
+
+def _branch_chunk(kind: str, n: int, counts: numpy.ndarray, rng) -> awkward.Array:
+    if kind == "float":
+        return rng.normal(size=n)
+    if kind == "int":
+        return rng.integers(0, 8, n).astype(numpy.int32)
+    if kind == "bool":
+        return rng.random(n) > 0.3
+    return awkward.unflatten(rng.exponential(30, counts.sum()).astype("f4"), counts)
+
+
+def _branch_type(array):
+    return array.type if isinstance(array, awkward.Array) else array.dtype
+
+
+def make_chunk(
+    n_entries: int, n_branches: int, rng: numpy.random.Generator
+) -> Dict[str, awkward.Array]:
+    """
+    Entries of every branch for one chunk. Jagged branches are grouped in
+    collections of up to 4 fields, the fields of a collection share a counter.
+    """
+    counts = rng.poisson(3, n_entries)
+    chunk: Dict[str, awkward.Array] = {}
+    collections: Dict[str, Dict[str, awkward.Array]] = {}
+    for idx in range(n_branches):
+        kind = BRANCH_KINDS[idx % len(BRANCH_KINDS)]
+        if kind == "jagged":
+            # Collection number changes every 4 jagged branches
+            jagged_idx = idx // len(BRANCH_KINDS)
+            fields = collections.setdefault(f"Coll{jagged_idx // 4}", {})
+            fields[f"f{jagged_idx % 4}"] = _branch_chunk(kind, n_entries, counts, rng)
+        else:
+            chunk[f"{kind}_{idx}"] = _branch_chunk(kind, n_entries, counts, rng)
+    for name, fields in collections.items():
+        chunk[name] = awkward.zip(fields)
+    return chunk
+
+
+def make_file(
+    path: str,
+    n_entries: int,
+    n_branches: int,
+    tree_path: str = "Events",
+    chunk_size: int = 1_000_000,
+    seed: int = 0,
+) -> str:
+    """
+    Writing the synthetic tree in chunks of entries, such that large trees do
+    not need to be held in memory. Existing files are reused.
+    """
+    if os.path.isfile(path):
+        return path
+    rng = numpy.random.default_rng(seed)
+    with uproot.recreate(path) as f:
+        for start in range(0, n_entries, chunk_size):
+            chunk = make_chunk(min(chunk_size, n_entries - start), n_branches, rng)
+            if start == 0:
+                # Assigning a dictionary would write an RNTuple instead of a TTree
+                f.mktree(tree_path, {k: _branch_type(v) for k, v in chunk.items()})
+            f[tree_path].extend(chunk)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", type=str, help="Path of the ROOT file to write")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--branches", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    make_file(args.output, args.entries, args.branches, chunk_size=args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,147 @@
 import argparse
+import concurrent.futures
 import os
-from typing import Optional, Dict
-
-# Methods for opening an array
-import awkward
+import sys
+from typing import TYPE_CHECKING, List, Optional
 
 # Textual TUI element
 import textual
 import textual.app
 import textual.containers
-import uproot
+import textual.timer
+import textual.worker
+
+from .column_cache import ColumnCache, parse_size
+from .file_scan import TreeInfo, pick_tree
+from .instrument import recorder, span, trace_allocations
+from .scheduler import JobCancelled, PlotJob, PlotScheduler
+from .summary_cache import SummaryCache
 
 # Custom widgets for array information display and manipulation
-from .widgets.array_summary import ArraySummary
+from .widgets.array_summary import ArraySummary, format_preview
 from .widgets.branch_select import BranchSelectInput, BranchSelectList
 from .widgets.dist_figure import DistributionFigure
 from .widgets.dist_summary import DistributionSummary
 from .widgets.file_selector import DisplayCurrentFile, FilePicker
+from .widgets.perf_panel import PerformancePanel
+
+# Methods for opening and summarizing arrays. These are the slowest imports, and
+# are only imported by the background workers, after the interface is drawn.
+if TYPE_CHECKING:
+    import awkward
+    import uproot
+
+    from .array_stats import ArrayStats, StatsAccumulator
+    from .lazy_array import LazyColumns
+    from .readers import ArrowTable, RNTupleTree
+
+
+class OpenedTree:
+    """
+    A file and tree opened by the background worker, with the caches of its
+    columns and statistics. The app state is only replaced by it on the main
+    thread, once the open has completed and if no newer open was requested in
+    the meantime. Plot jobs keep the OpenedTree they were submitted for.
+    """
+
+    def __init__(
+        self,
+        file: str,
+        file_id: Optional[str],
+        trees: List[TreeInfo],
+        tree_info: TreeInfo,
+        tree: "uproot.TTree | RNTupleTree | ArrowTable",
+        columns: "LazyColumns",
+        stats_cache: ColumnCache,
+    ):
+        self.file = file
+        self.file_id = file_id
+        self.trees = trees
+        self.tree_info = tree_info
+        self.tree = tree
+        self.columns = columns
+        # The caches belong to this file only, such that reads still running
+        # once another file is opened never store their results for it
+        self.column_cache = columns.cache
+        self.stats_cache = stats_cache
+
+    @property
+    def tree_path(self) -> str:
+        return self.tree_info.path
 
 
 class UprootBrowser(textual.app.App):
+    # Budget of the statistics of plot definitions, per file
+    stats_cache_size = parse_size("64MB")
+
     BINDINGS = [
         textual.app.Binding("ctrl+o", "open_file_dialog", "[O]pen File"),
         textual.app.Binding("ctrl+r", "redraw_plot", "[R]edraw Plot"),
+        textual.app.Binding("ctrl+t", "toggle_stats", "[T]iming Stats"),
+        textual.app.Binding("ctrl+y", "toggle_array_summary", "Arra[y] Values"),
     ]
 
     def __init__(
-        self, file_path: Optional[str] = None, tree_path: Optional[str] = None
+        self,
+        file_path: Optional[str] = None,
+        tree_path: Optional[str] = None,
+        streaming: bool = False,
+        chunk_size: int = 1_000_000,
+        workers: int = 1,
+        cache_size: Optional[int] = None,
+        summary_cache: Optional[SummaryCache] = None,
+        preview: bool = False,
+        prefetch: bool = True,
     ):
         super().__init__()
+        # Whether branches are streamed in chunks instead of loaded in full
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        # Whether an approximate plot from a sample of baskets is shown first
+        self.preview = preview
+        self.preview_baskets = 5
+        # Separate pools for the uproot decompression and for the basket reads
+        # and histogram filling, as the latter waits on the former.
+        self.n_workers = workers
+        self.executor: Optional[concurrent.futures.Executor] = None
+        self.io_executor: Optional[concurrent.futures.Executor] = None
+        if workers > 1:
+            self.executor = concurrent.futures.ThreadPoolExecutor(workers)
+            self.io_executor = concurrent.futures.ThreadPoolExecutor(workers)
         # Identifier for what is opened
         self.file: Optional[str] = None
         self.tree_path: Optional[str] = None
-        # The array proper for what is going to be displayed
-        self.lazy_array: Optional[uproot.models.TTree.Model_TTree] = None
-        self.array: Dict[str, awkward.Array] = {}
-        self._load_file_memory(file_path, tree_path)
+        # The tree handle is kept open, branches are only read on request
+        self.lazy_array: Optional[uproot.TTree | RNTupleTree | ArrowTable] = None
+        self.array: Optional[LazyColumns] = None
+        self.opened: Optional[OpenedTree] = None
+        # Metadata of the trees in the file and of the opened tree
+        self.trees: List[TreeInfo] = []
+        self.tree_info: Optional[TreeInfo] = None
+        # Loaded columns and evaluated sub-expressions of the plot definitions
+        # for the open file, sharing a single memory budget. New caches are
+        # created for every opened file.
+        self.cache_size = cache_size
+        self.column_cache = ColumnCache(cache_size)
+        # Summaries kept on disk across sessions, None if disabled
+        self.summary_cache = summary_cache
+        self.file_id: Optional[str] = None
+        # Statistics of plot definitions keyed by their normalized expression,
+        # filled by plots and by the prefetching of highlighted branches
+        self.stats_cache = ColumnCache(self.stats_cache_size)
+        # Prefetching highlighted branches after a short delay, including up to
+        # prefetch_neighbors of the adjacent matches
+        self.prefetch = prefetch
+        self.prefetch_delay = 0.3
+        self.prefetch_neighbors = 1
+        self._prefetch_timer: Optional[textual.timer.Timer] = None
+        # Plot requests, only the latest one is computed and displayed
+        self.plot_scheduler = PlotScheduler(self, self._plot_worker)
+        # File opening is deferred to a background worker once mounted
+        self._init_paths = (file_path, tree_path)
 
         # Display elements for choosing branches
-        self.branch_select_list = BranchSelectList(array=self.array)
+        self.branch_select_list = BranchSelectList(ttree=self.lazy_array)
         self.branch_select_input = BranchSelectInput(list_view=self.branch_select_list)
         self._var_select_group = textual.containers.VerticalGroup(
             self.branch_select_input, self.branch_select_list
@@ -62,6 +165,7 @@ class UprootBrowser(textual.app.App):
         # Floating elements for displaying text help messages and dialog
         self.warn = WarningBlock()
         self.error = ErrorBlock()
+        self.perf_panel = PerformancePanel(recorder)
 
         # Styling of display elements is place somewhere else
         self._init_style()
@@ -90,58 +194,143 @@ class UprootBrowser(textual.app.App):
         # Floating elements
         yield self.warn
         yield self.error
+        yield self.perf_panel
+
+    def on_mount(self) -> None:
+        # Starting the background work only once the first frame is drawn
+        self.call_after_refresh(self._after_first_frame)
+
+    def _after_first_frame(self) -> None:
+        if self._init_paths[0] is not None:
+            self.open_file(*self._init_paths)
+        else:
+            self._import_worker()
+
+    @textual.work(thread=True, exclusive=True, group="file", exit_on_error=False)
+    def _import_worker(self) -> None:
+        # Importing ahead of the first file being opened
+        from . import lazy_array, streaming  # noqa: F401
 
     def open_file(self, file_path: str, tree_path: str):
-        if self._load_file_memory(file_path, tree_path):
+        # Plots and prefetches of the previous file are no longer relevant
+        self.plot_scheduler.cancel()
+        self.workers.cancel_group(self, "plot")
+        self._cancel_prefetch()
+        self.file_display.update_progress(f"Opening {file_path}", 0, None)
+        self._open_file_worker(file_path, tree_path)
+
+    @textual.work(thread=True, exclusive=True, group="file", exit_on_error=False)
+    def _open_file_worker(self, file_path: str, tree_path: str) -> None:
+        worker = textual.worker.get_current_worker()
+        opened = self._load_file_memory(file_path, tree_path)
+        if worker.is_cancelled:
+            return
+        self.call_from_thread(self._finish_open_file, worker, opened)
+
+    def _finish_open_file(
+        self, worker: textual.worker.Worker, opened: Optional[OpenedTree]
+    ) -> None:
+        # A newer open cancels this worker on the main thread, so an open that
+        # completes late never replaces the state of the newer file
+        if worker.is_cancelled:
+            return
+        self.file_display.update_progress(
+            "Opened" if opened is not None else "Failed to open", 1, 1
+        )
+        if opened is not None:
+            self._set_opened(opened)
             self._load_file_interface()
 
+    def action_toggle_stats(self):
+        self.perf_panel.toggle()
+
+    def action_toggle_array_summary(self):
+        self.array_summary.toggle_expanded()
+        # Giving the expanded summary as much room as the figure
+        expanded = self.array_summary.expanded
+        self._summary_cont.styles.height = "3fr" if expanded else "1fr"
+
     def action_open_file_dialog(self):
         self.push_screen(FilePicker(self.file_display))
 
-    def _load_file_memory(self, file_path: str | None, tree_path: str | None) -> bool:
-        self.file = None
-        self.tree_path = None
-        self.array = None
-
-        if file_path is None or tree_path is None:
-            return False
-        if not os.path.isfile(file_path):
+    def _load_file_memory(
+        self, file_path: str | None, tree_path: str | None
+    ) -> Optional[OpenedTree]:
+        """
+        Opening the file and tree, called from the background worker. Nothing
+        of the app state is modified here, the result is assigned with
+        _set_opened on the main thread.
+        """
+        from .lazy_array import LazyColumns
+        from .readers import is_url, open_reader
+
+        if file_path is None:
+            return None
+        if not is_url(file_path) and not os.path.isfile(file_path):
             textual.app.warnings.warn("Requested path is not a file")
-            return False
+            return None
         try:
-            uproot_file = uproot.open(file_path)
+            with span("open", file=file_path):
+                reader = open_reader(file_path, executor=self.io_executor)
+        except ImportError as err:  # Optional backend that is not installed
+            textual.app.warnings.warn(str(err))
+            return None
         except Exception:  # Capturing all errors
             textual.app.warnings.warn("Failed to open file")
-            return False
-
-        self.file = file_path
-        if tree_path not in uproot_file:
-            textual.app.warnings.warn("Tree path does not exist")
-            return False
-
-        tree = uproot_file[tree_path]
-        if not (
-            isinstance(tree, uproot.models.TTree.Model_TTree)
-            or isinstance(tree, uproot.models.TTree.Model_TTree_v16)
-            or isinstance(tree, uproot.models.TTree.Model_TTree_v17)
-            or isinstance(tree, uproot.models.TTree.Model_TTree_v18)
-            or isinstance(tree, uproot.models.TTree.Model_TTree_v19)
-            or isinstance(tree, uproot.models.TTree.Model_TTree_v20)
-        ):
-            textual.app.warnings.warn("Tree path does not point to a tree")
-            textual.app.warnings.warn(f"Got type {type(uproot_file[tree_path])}")
-            return False
-
-        self.tree_path = tree_path
-        self.array = uproot_file[tree_path].arrays()
-        return True
+            return None
+
+        try:
+            with span("scan", file=file_path):
+                trees = reader.scan()
+        except Exception:  # Capturing all errors, such as corrupt metadata
+            textual.app.warnings.warn("Failed to list the trees of the file")
+            reader.close()
+            return None
+        # Without a tree path, the largest tree of the file is opened
+        info = pick_tree(trees, tree_path)
+        if info is None:
+            if not tree_path:
+                textual.app.warnings.warn("No tree found in file")
+            else:
+                textual.app.warnings.warn("Tree path does not exist")
+            reader.close()
+            return None
+
+        try:
+            with span("open", tree=info.path):
+                tree = reader.tree(info.path)
+        except Exception as err:  # Reporting objects that are not trees
+            textual.app.warnings.warn(str(err))
+            reader.close()
+            return None
+
+        columns = LazyColumns(tree, cache=ColumnCache(self.cache_size))
+        columns.executor = self.executor
+        stats_cache = ColumnCache(self.stats_cache_size)
+        return OpenedTree(
+            file_path, reader.file_id, trees, info, tree, columns, stats_cache
+        )
+
+    def _set_opened(self, opened: OpenedTree) -> None:
+        self.opened = opened
+        self.file = opened.file
+        self.file_id = opened.file_id
+        self.tree_path = opened.tree_path
+        self.trees = opened.trees
+        self.tree_info = opened.tree_info
+        self.lazy_array = opened.tree
+        self.array = opened.columns
+        self.column_cache = opened.column_cache
+        self.stats_cache = opened.stats_cache
 
     def _load_file_interface(self) -> None:
         # Calling the various items to be updated
         self.file_display.update_paths(self.file, self.tree_path)
         self._clear_plot_display()
         self.branch_select_input.clear()
-        self.branch_select_list._update_with_array(self.array)
+        self.branch_select_list._update_with_tree(
+            self.lazy_array, self.tree_info.sizes() if self.tree_info else None
+        )
 
     def _update_file_display(self):
         self.display_file.clear()
@@ -162,11 +351,262 @@ class UprootBrowser(textual.app.App):
         self.execute_plot()
 
     def execute_plot(self):
-        run_process = self.def_input.value.replace("array", "self.array")
-        array = eval(run_process)
+        if self.opened is None:
+            return
+        # A new request makes any earlier request stale, bursts of requests
+        # are collapsed into the latest one
+        self.plot_scheduler.submit(self.def_input.value, self.opened)
+
+    @textual.work(thread=True, exclusive=True, group="plot", exit_on_error=False)
+    def _plot_worker(self, job: PlotJob) -> None:
+        expression, columns = job.expression, job.columns
+        try:
+            with span("plot", generation=job.generation):
+                cache_key = self._summary_key(job.opened, expression)
+                record = (
+                    None if cache_key is None else self.summary_cache.load(cache_key)
+                )
+                if record is not None:
+                    # Summaries from previous sessions do not need any baskets
+                    job.call(self._update_cached_display, record)
+                    return
+                if self.preview:
+                    self._plot_preview(expression, columns, job)
+                if self.streaming:
+                    self._plot_streaming(expression, columns, job)
+                else:
+                    self._plot_full(expression, columns, job)
+        except JobCancelled:
+            return
+        except Exception as err:  # Capturing all errors in user expressions
+            if job.is_current:
+                textual.app.warnings.warn(f"Failed to evaluate expression: {err}")
+
+    def _plot_preview(self, expression: str, columns: "LazyColumns", job: PlotJob):
+        from .expression import parse
+        from .streaming import sample_stats
+
+        branches = [b for b in parse(expression).branches if b in columns]
+        if all(columns.is_loaded(b) for b in branches):
+            return  # The exact result does not require any reads
+        ranges = columns.sample_ranges(branches, self.preview_baskets)
+        fraction = sum(b - a for a, b in ranges) / max(columns.num_entries, 1)
+        if not ranges or fraction >= 0.5:
+            return  # Not worth a preview
+        array, accumulator = sample_stats(expression, columns, ranges)
+        job.call(self._update_preview_display, array, accumulator.finalize(), fraction)
+
+    def _plot_full(self, expression: str, columns: "LazyColumns", job: PlotJob):
+        from .expression import evaluate, parse
+        from .streaming import accumulate_parallel
+
+        def _progress(name: str, done: int, total: int):
+            job.call(self.file_display.update_progress, f"Reading {name}", done, total)
+
+        # Reading the branches the expression depends on before evaluating,
+        # the evaluation uses the same arrays even if they exceed the cache
+        view = columns.monitored(_progress)
+        self._plot_counter(parse(expression).branch, view, job)
+        view = view.pinned(parse(expression).branches)
+        job.check()
+        array = evaluate(expression, view, job.opened.column_cache)
+        job.check()
+        stats = job.opened.stats_cache.get(
+            parse(expression).key,
+            lambda: accumulate_parallel(
+                array, self.executor, self.n_workers
+            ).finalize(),
+        )
+        job.call(self._update_plot_display, array, stats)
+        self._store_summary(
+            job.opened,
+            expression,
+            str(array.type),
+            array.ndim,
+            format_preview(array),
+            stats,
+        )
+
+    def _plot_counter(
+        self, name: Optional[str], columns: "LazyColumns", job: PlotJob
+    ) -> None:
+        from .array_stats import ArrayStats
+
+        # The multiplicity of a jagged branch is known from its counter branch,
+        # which is much smaller than the content
+        if name is None or name not in columns or columns.is_loaded(name):
+            return
+        counter = columns.counter(name)
+        if counter is None:
+            return
+        stats = ArrayStats.from_array(columns[counter])
+        job.call(self._update_counter_display, counter, name, stats)
+
+    def _plot_streaming(self, expression: str, columns: "LazyColumns", job: PlotJob):
+        # The array summary only displays the first chunk, while the figure is
+        # updated progressively as chunks arrive. A newer request stops the
+        # stream between chunks.
+        from .streaming import stream_stats
+
+        first = {"length": 0}
+
+        def _on_chunk(done: int, total: int, array, accumulator: "StatsAccumulator"):
+            job.check()
+            stats = accumulator.finalize()
+            first["length"] += len(array)
+            if done <= self.chunk_size:
+                first["array"] = array
+                job.call(self.array_summary.update_content, array)
+            job.call(self._update_stats_display, stats)
+            job.call(
+                self.dist_figure.set_status, f"streamed {done / total:.1%} of entries"
+            )
+            job.call(self.file_display.update_progress, "Streaming", done, total)
+
+        accumulator = stream_stats(
+            expression,
+            columns,
+            self.chunk_size,
+            _on_chunk,
+            executor=self.executor,
+            n_parallel=self.n_workers,
+        )
+        job.call(self.dist_figure.set_status, "")
+        if "array" in first:
+            array = first["array"]
+            type_str = f"{first['length']} * {array.type.content}"
+            self._store_summary(
+                job.opened,
+                expression,
+                type_str,
+                array.ndim,
+                format_preview(array),
+                accumulator.finalize(),
+            )
+
+    def _summary_key(self, opened: OpenedTree, expression: str) -> Optional[str]:
+        # Keyed by the file the plot was requested for, which may no longer be
+        # the open one
+        from .expression import parse
+
+        if self.summary_cache is None or opened.file_id is None:
+            return None
+        return self.summary_cache.key(
+            opened.file_id, opened.tree_path, parse(expression).key
+        )
+
+    def _store_summary(
+        self,
+        opened: OpenedTree,
+        expression: str,
+        type_str: str,
+        ndim: int,
+        values: str,
+        stats: "ArrayStats",
+    ) -> None:
+        cache_key = self._summary_key(opened, expression)
+        if cache_key is None:
+            return
+        record = {
+            "type": type_str,
+            "ndim": ndim,
+            "values": values,
+            "stats": stats.to_dict(),
+        }
+        self.summary_cache.store(cache_key, record)
+
+    def _update_cached_display(self, record: dict) -> None:
+        from .array_stats import ArrayStats
+
+        self.file_display.update_progress("Cached summary", 1, 1)
+        self.dist_figure.set_status("cached")
+        self.array_summary.update_text(record["type"], record["ndim"], record["values"])
+        self._update_stats_display(ArrayStats.from_dict(record["stats"]))
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch_timer is not None:
+            self._prefetch_timer.stop()
+            self._prefetch_timer = None
+        self.workers.cancel_group(self, "prefetch")
+
+    def schedule_prefetch(self, names: List[str]) -> None:
+        # Any prefetch of the previous highlight is no longer relevant
+        self._cancel_prefetch()
+        if not self.prefetch or self.streaming or self.opened is None:
+            return
+        names = names[: 1 + 2 * self.prefetch_neighbors]
+        opened = self.opened
+        self._prefetch_timer = self.set_timer(
+            self.prefetch_delay, lambda: self._prefetch_worker(names, opened)
+        )
+
+    @textual.work(thread=True, exclusive=True, group="prefetch", exit_on_error=False)
+    def _prefetch_worker(self, names: List[str], opened: OpenedTree) -> None:
+        from .expression import parse
+        from .lazy_array import LoadCancelled
+        from .streaming import accumulate_parallel
+
+        worker = textual.worker.get_current_worker()
+
+        def _stopped() -> bool:
+            # Cancelled, or another file was opened since the prefetch started
+            return worker.is_cancelled or self.opened is not opened
+
+        def _progress(name: str, done: int, total: int):
+            if _stopped():
+                raise LoadCancelled()
+
+        columns = opened.columns
+        view = columns.monitored(_progress)
+        for name in names:
+            expression = f"array[{name!r}]"
+            key = parse(expression).key
+            if _stopped():
+                return
+            if key in opened.stats_cache:
+                continue
+            cache_key = self._summary_key(opened, expression)
+            if cache_key is not None and cache_key in self.summary_cache:
+                continue
+            # Prefetching should never evict columns that are already loaded
+            if not columns.is_loaded(name) and not opened.column_cache.fits(
+                columns.branch(name).uncompressed_bytes
+            ):
+                continue
+            try:
+                array = view[name]
+                if _stopped():
+                    return
+                opened.stats_cache.get(
+                    key, lambda: accumulate_parallel(array).finalize()
+                )
+            except LoadCancelled:
+                return
+            except Exception:  # Failures are reported when the branch is plotted
+                continue
+
+    def _update_plot_display(self, array: "awkward.Array", stats: "ArrayStats") -> None:
+        self.dist_figure.set_status("")
+        self.array_summary.update_content(array)
+        self._update_stats_display(stats)
+
+    def _update_preview_display(
+        self, array: "awkward.Array", stats: "ArrayStats", fraction: float
+    ) -> None:
+        self.dist_figure.set_status(f"preview of {fraction:.1%} of entries, refining")
         self.array_summary.update_content(array)
-        self.dist_summary.update_content(array)
-        self.dist_figure.update_content(array)
+        self._update_stats_display(stats)
+
+    def _update_counter_display(
+        self, counter: str, name: str, stats: "ArrayStats"
+    ) -> None:
+        self.dist_figure.set_status(f"multiplicity from {counter}, reading {name}")
+        self._update_stats_display(stats)
+
+    def _update_stats_display(self, stats: "ArrayStats") -> None:
+        self.file_display.update_cache(self.column_cache.summary())
+        self.dist_summary.update_content(stats)
+        self.dist_figure.update_content(stats)
 
 
 class PlotDefineInput(textual.widgets.Input):
@@ -223,14 +663,98 @@ class ErrorBlock(textual.widgets.Static):
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
-        "file", nargs="?", type=str, help="Specifying a root file to be used"
+        "file",
+        nargs="?",
+        type=str,
+        help="Specifying a root file to be used, local or as a URL",
     )
     parser.add_argument(
         "--tree_path",
         type=str,
-        help="Path to tree within the root file",
-        default="Events",
+        help="Path to tree within the root file, the largest tree if not given",
+        default=None,
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream branches in chunks of entries instead of loading them in full",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="Number of entries per chunk in streaming mode",
+        default=1_000_000,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of threads used for decompression and histogram filling",
+        default=1,
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=parse_size,
+        help="Memory budget for loaded branches, for example 4GB",
+        default="4GB",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk cache of branch summaries",
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Plot from a sample of baskets first, then refine to the full tree",
+    )
+    parser.add_argument(
+        "--no-prefetch",
+        action="store_true",
+        help="Do not read the highlighted branch before it is submitted",
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="OUTPUT",
+        help="Summarize every branch without the interface, written as JSON or CSV",
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        help="Writing the timed sections as a Chrome trace JSON file on exit",
+    )
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="Counting memory allocations in the timed sections (slower)",
     )
     args = parser.parse_args()
-    app = UprootBrowser(args.file, args.tree_path)
+    trace_allocations(args.trace_allocations)
+    if args.batch is not None:
+        from .batch import main_batch
+
+        if args.file is None:
+            parser.error("--batch requires a file")
+        try:
+            code = main_batch(
+                args.file, args.tree_path, args.batch, args.workers, args.chunk_size
+            )
+        except ValueError as err:  # Missing trees
+            parser.error(str(err))
+        if args.trace_file is not None:
+            recorder.write_trace(args.trace_file)
+        sys.exit(code)
+    app = UprootBrowser(
+        args.file,
+        args.tree_path,
+        streaming=args.streaming,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        cache_size=args.cache_size,
+        summary_cache=None if args.no_cache else SummaryCache(),
+        preview=args.preview,
+        prefetch=not args.no_prefetch,
+    )
     app.run()
+    if args.trace_file is not None:
+        recorder.write_trace(args.trace_file)
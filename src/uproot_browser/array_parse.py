@@ -1,7 +1,8 @@
 from enum import Enum
+from typing import TYPE_CHECKING
 
-import awkward
-import numpy
+if TYPE_CHECKING:
+    import awkward
 
 
 class ArraySummaryType(Enum):
@@ -10,52 +11,24 @@ class ArraySummaryType(Enum):
     continuous = 2
 
 
-def detect_summary_type(array: awkward.Array) -> str:
-    def determine_layout_type(layout):
-        if hasattr(layout, "layout"):
-            return determine_layout_type(layout.layout)
-        elif hasattr(layout, "content"):
-            return determine_layout_type(layout.content)
-        return layout.dtype
+def detect_summary_type(array: "awkward.Array") -> ArraySummaryType:
+    """Summary type of the array, following the rules of ArrayStats"""
+    # Imported here, such that the summary type can be used by the widgets
+    # without loading the array libraries
+    import numpy
 
-    dtype = determine_layout_type(array.layout)
-    # Boolean type
-    if dtype == numpy.bool:
-        return ArraySummaryType.boolean
-    # Integer types
-    if dtype not in [
-        numpy.uint,
-        numpy.uint8,
-        numpy.uint16,
-        numpy.uint32,
-        numpy.uint64,
-        numpy.int8,
-        numpy.int16,
-        numpy.int32,
-        numpy.int64,
-    ]:
-        return ArraySummaryType.continuous
+    from .array_stats import classify_integers, flatten_content
 
-    # Checking for continuity
-    if array.ndim != 1:
-        array = awkward.flatten(array)
-    unique = numpy.unique(array.to_numpy())
-    if len(unique) == 0:
-        return ArraySummaryType.discrete
-    min, max = numpy.min(unique), numpy.max(unique)
-    span = numpy.arange(min, max + 1)
-
-    # Integer arrays are considered "pseudo-continuous" if:
-    # - The unique values density covers the min/max values (>90% occupancy).
-    # - There are more than 10 distinct values.
-    # If both are true, then we are assuming that this integer array is some form of counting array
-    if (len(unique) > 0.9 * len(span)) and len(span) > 10:
+    flat = flatten_content(array)
+    if flat.dtype == numpy.bool_:
+        return ArraySummaryType.boolean
+    if not numpy.issubdtype(flat.dtype, numpy.integer):
         return ArraySummaryType.continuous
-    else:
-        return ArraySummaryType.discrete
+    return classify_integers(numpy.unique(flat))
 
 
 if __name__ == "__main__":
+    import awkward
     import uproot
 
     arr = uproot.open("treemaker.root")["PreSelection"].arrays()
@@ -0,0 +1,709 @@
+import abc
+import copy
+from typing import List, Optional, Sequence, Tuple
+
+import awkward
+import numpy
+
+from .array_parse import ArraySummaryType
+from .instrument import span
+
+# Integer arrays with a wider value span than this are not counted with bincount
+_MAX_BINCOUNT_SPAN = 1 << 24
+
+# Quantiles bounding the plotted range, values outside are under/overflow
+ROBUST_RANGE = (0.001, 0.999)
+
+
+def _content_buffer(layout: awkward.contents.Content) -> Optional[numpy.ndarray]:
+    # View of the values referenced by the layout, None if a copy is required
+    if isinstance(layout, awkward.contents.NumpyArray):
+        return numpy.asarray(layout.data).reshape(-1)
+    if isinstance(layout, awkward.contents.ListOffsetArray):
+        offsets = numpy.asarray(layout.offsets)
+        return _content_buffer(layout.content[offsets[0] : offsets[-1]])
+    if isinstance(layout, awkward.contents.RegularArray):
+        return _content_buffer(layout.content[: layout.length * layout.size])
+    return None
+
+
+def flatten_content(array: awkward.Array) -> numpy.ndarray:
+    """
+    Single flattened numpy buffer of all the values in the array. For lists of
+    numbers this is a view of the content buffer between the first and last
+    offsets, other layouts (options, records, ...) are flattened into a copy.
+    """
+    flat = _content_buffer(array.layout)
+    if flat is not None:
+        return flat
+    return awkward.to_numpy(awkward.flatten(array, axis=None))
+
+
+def list_counts(array: awkward.Array) -> Optional[numpy.ndarray]:
+    """Number of elements in each entry of a jagged array, from the offsets only"""
+    layout = array.layout
+    if isinstance(layout, awkward.contents.ListOffsetArray):
+        return numpy.diff(numpy.asarray(layout.offsets))
+    if isinstance(layout, awkward.contents.ListArray):
+        return numpy.asarray(layout.stops) - numpy.asarray(layout.starts)
+    return None
+
+
+def _add_counts(
+    first: Optional[numpy.ndarray], second: Optional[numpy.ndarray]
+) -> Optional[numpy.ndarray]:
+    # Summing bincount arrays of different lengths
+    if first is None or second is None:
+        return second if first is None else first
+    total = numpy.zeros(max(len(first), len(second)), dtype=numpy.int64)
+    total[: len(first)] += first
+    total[: len(second)] += second
+    return total
+
+
+def classify_integers(unique: numpy.ndarray) -> ArraySummaryType:
+    if len(unique) == 0:
+        return ArraySummaryType.discrete
+    span = int(unique[-1]) - int(unique[0]) + 1
+    # Integer arrays are considered "pseudo-continuous" if:
+    # - The unique values density covers the min/max values (>90% occupancy).
+    # - There are more than 10 distinct values.
+    # If both are true, then we are assuming that this integer array is some
+    # form of counting array
+    if (len(unique) > 0.9 * span) and span > 10:
+        return ArraySummaryType.continuous
+    else:
+        return ArraySummaryType.discrete
+
+
+class ArrayStats:
+    """
+    Statistics of an array shared by the figure and summary widgets, computed
+    from a single flattened buffer of the array.
+    """
+
+    def __init__(self, summary_type: ArraySummaryType, count: int):
+        self.summary_type = summary_type
+        self.count = count
+        # Boolean arrays
+        self.n_true: Optional[int] = None
+        # Discrete arrays
+        self.unique: Optional[numpy.ndarray] = None
+        self.unique_counts: Optional[numpy.ndarray] = None
+        # Continuous arrays
+        self.min = None
+        self.max = None
+        self.mean: Optional[float] = None
+        self.std: Optional[float] = None
+        self.hist_centers: Optional[numpy.ndarray] = None
+        self.hist_counts: Optional[numpy.ndarray] = None
+        # Continuous arrays: approximate quantiles, and the number of finite
+        # values left out of the histogram range
+        self.median: Optional[float] = None
+        self.q1: Optional[float] = None
+        self.q3: Optional[float] = None
+        self.underflow = 0
+        self.overflow = 0
+        # Whether the histogram counts are estimated from the quantile sketch
+        self.hist_approximate = False
+        # Jagged arrays: number of entries with a given number of elements
+        self.multiplicity_counts: Optional[numpy.ndarray] = None
+
+    @property
+    def mode(self):
+        if self.unique is None or len(self.unique) == 0:
+            return None
+        return self.unique[numpy.argmax(self.unique_counts)]
+
+    @property
+    def iqr(self) -> Optional[float]:
+        if self.q1 is None or self.q3 is None:
+            return None
+        return self.q3 - self.q1
+
+    @property
+    def mean_multiplicity(self) -> Optional[float]:
+        counts = self.multiplicity_counts
+        if counts is None or counts.sum() == 0:
+            return None
+        return float(numpy.dot(numpy.arange(len(counts)), counts) / counts.sum())
+
+    @classmethod
+    def from_array(cls, array: awkward.Array, bins: int = 40) -> "ArrayStats":
+        accumulator = StatsAccumulator()
+        flat = flatten_content(array)
+        accumulator.update_flat(flat)
+        accumulator.update_multiplicity(array)
+        accumulator.values = flat
+        return accumulator.finalize(bins=bins)
+
+    @property
+    def nbytes(self) -> int:
+        # Allowing the statistics to be held in a ColumnCache
+        return sum(
+            getattr(self, attr).nbytes
+            for attr in self._array_attrs
+            if getattr(self, attr) is not None
+        )
+
+    # Attributes holding numpy arrays or numpy scalars
+    _array_attrs = [
+        "unique",
+        "unique_counts",
+        "hist_centers",
+        "hist_counts",
+        "multiplicity_counts",
+    ]
+    _scalar_attrs = [
+        "n_true",
+        "min",
+        "max",
+        "mean",
+        "std",
+        "median",
+        "q1",
+        "q3",
+        "underflow",
+        "overflow",
+        "hist_approximate",
+    ]
+
+    def to_dict(self) -> dict:
+        """JSON serializable representation of the statistics"""
+        record = {"summary_type": self.summary_type.name, "count": int(self.count)}
+        for attr in self._array_attrs:
+            value = getattr(self, attr)
+            record[attr] = None if value is None else value.tolist()
+        for attr in self._scalar_attrs:
+            value = getattr(self, attr)
+            record[attr] = value.item() if hasattr(value, "item") else value
+        return record
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "ArrayStats":
+        stats = cls(ArraySummaryType[record["summary_type"]], record["count"])
+        for attr in cls._array_attrs:
+            if record.get(attr) is not None:
+                setattr(stats, attr, numpy.asarray(record[attr]))
+        for attr in cls._scalar_attrs:
+            setattr(stats, attr, record.get(attr, getattr(stats, attr)))
+        return stats
+
+
+class _AdaptiveHistogram:
+    """
+    Histogram with bins of width 2**exponent aligned to multiples of the width.
+    When new values fall outside the current range, the range is extended, and
+    pairs of bins are merged whenever the number of bins would exceed max_bins.
+    This allows the histogram to be filled chunk by chunk without knowing the
+    value range in advance.
+    """
+
+    def __init__(self, max_bins: int = 1024, min_exponent: Optional[int] = None):
+        self.max_bins = max_bins
+        self.min_exponent = min_exponent
+        self.exponent: Optional[int] = None
+        self.low = 0  # Index of the first bin in units of the bin width
+        self.counts = numpy.zeros(0, dtype=numpy.int64)
+
+    @property
+    def width(self) -> float:
+        return 2.0**self.exponent
+
+    def _init_exponent(self, vmin: float, vmax: float):
+        span = vmax - vmin
+        magnitude = max(abs(vmin), abs(vmax))
+        if span > 0:
+            exponent = int(numpy.ceil(numpy.log2(span / self.max_bins)))
+        elif magnitude > 0:
+            exponent = int(numpy.floor(numpy.log2(magnitude))) - 4
+        else:
+            exponent = 0
+        # Keeping the bin indices within the float precision
+        if magnitude > 0:
+            exponent = max(exponent, int(numpy.ceil(numpy.log2(magnitude))) - 50)
+        if self.min_exponent is not None:
+            exponent = max(exponent, self.min_exponent)
+        self.exponent = exponent
+        self.low = int(numpy.floor(vmin / self.width))
+
+    def _coarsen(self):
+        # Merging pairs of bins, doubling the bin width
+        self.exponent += 1
+        if len(self.counts) == 0:
+            self.low //= 2
+            return
+        index = numpy.arange(self.low, self.low + len(self.counts)) // 2
+        new_low = self.low // 2
+        self.counts = numpy.bincount(
+            index - new_low, weights=self.counts, minlength=index[-1] - new_low + 1
+        ).astype(numpy.int64)
+        self.low = new_low
+
+    def _span(self, vmin: float, vmax: float) -> Tuple[int, int]:
+        # First and last bin indices required to cover existing and new values
+        first = int(numpy.floor(vmin / self.width))
+        last = int(numpy.floor(vmax / self.width))
+        if len(self.counts):
+            first = min(first, self.low)
+            last = max(last, self.low + len(self.counts) - 1)
+        return first, last
+
+    def fill(self, values: numpy.ndarray):
+        if len(values) == 0:
+            return
+        vmin, vmax = float(values.min()), float(values.max())
+        if self.exponent is None:
+            self._init_exponent(vmin, vmax)
+        first, last = self._span(vmin, vmax)
+        while last - first + 1 > self.max_bins:
+            self._coarsen()
+            first, last = self._span(vmin, vmax)
+
+        counts = numpy.zeros(last - first + 1, dtype=numpy.int64)
+        offset = self.low - first
+        counts[offset : offset + len(self.counts)] = self.counts
+        index = numpy.floor(values / self.width).astype(numpy.int64) - first
+        counts += numpy.bincount(index, minlength=len(counts))
+        self.low, self.counts = first, counts
+
+    def merge(self, other: "_AdaptiveHistogram"):
+        if other.exponent is None:
+            return
+        if self.exponent is None:
+            self.exponent, self.low = other.exponent, other.low
+            self.counts = other.counts.copy()
+            return
+        # Bringing both histograms to a common bin width and range
+        other = copy.copy(other)
+        while other.exponent < self.exponent:
+            other._coarsen()
+        while self.exponent < other.exponent:
+            self._coarsen()
+        while True:
+            first = min(self.low, other.low)
+            last = max(
+                self.low + len(self.counts) - 1, other.low + len(other.counts) - 1
+            )
+            if last - first + 1 <= self.max_bins:
+                break
+            self._coarsen()
+            other._coarsen()
+        counts = numpy.zeros(last - first + 1, dtype=numpy.int64)
+        for hist in (self, other):
+            offset = hist.low - first
+            counts[offset : offset + len(hist.counts)] += hist.counts
+        self.low, self.counts = first, counts
+
+    def rebin(self, bins: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Edges and counts with adjacent bins grouped to at most `bins` bins"""
+        return self._group(self.low, self.counts, bins)
+
+    def _group(
+        self, low: int, counts: numpy.ndarray, bins: int
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        if len(counts) == 0:
+            return numpy.array([]), numpy.array([], dtype=numpy.int64)
+        factor = -(-len(counts) // bins)
+        padded = numpy.zeros(-(-len(counts) // factor) * factor, numpy.int64)
+        padded[: len(counts)] = counts
+        counts = padded.reshape(-1, factor).sum(axis=1)
+        edges = (low + factor * numpy.arange(len(counts) + 1)) * self.width
+        return edges, counts
+
+    def n_bins(self, vmin: float, vmax: float) -> int:
+        """Number of filled bins spanned by the [vmin, vmax] range"""
+        first, last = self._index_range(vmin, vmax)
+        return max(last - first + 1, 0)
+
+    def _index_range(self, vmin: float, vmax: float) -> Tuple[int, int]:
+        # Bins of the range, relative to the first bin, clipped to the filled bins
+        first = max(int(numpy.floor(vmin / self.width)) - self.low, 0)
+        last = min(int(numpy.floor(vmax / self.width)) - self.low, len(self.counts) - 1)
+        return first, last
+
+    def rebin_range(
+        self, vmin: float, vmax: float, bins: int
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, int, int]:
+        """
+        Edges and counts of the bins spanning [vmin, vmax], grouped to at most
+        `bins` bins, with the counts of the bins below and above the range.
+        """
+        first, last = self._index_range(vmin, vmax)
+        edges, counts = self._group(
+            self.low + first, self.counts[first : last + 1], bins
+        )
+        underflow = int(self.counts[:first].sum())
+        overflow = int(self.counts[last + 1 :].sum())
+        return edges, counts, underflow, overflow
+
+
+class _Quantiles(abc.ABC):
+    """
+    Quantiles and ranks from sorted values with cumulative weights, provided
+    by _weighted in the subclasses.
+    """
+
+    count = 0
+
+    @abc.abstractmethod
+    def _weighted(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        pass
+
+    def quantiles(self, fractions: Sequence[float]) -> Optional[numpy.ndarray]:
+        if self.count == 0:
+            return None
+        values, cumulative = self._weighted()
+        index = numpy.searchsorted(
+            cumulative, numpy.asarray(fractions) * cumulative[-1], side="left"
+        )
+        return values[numpy.minimum(index, len(values) - 1)]
+
+    def ranks(self, points: numpy.ndarray) -> numpy.ndarray:
+        """Estimated number of values less than each of the points"""
+        if self.count == 0:
+            return numpy.zeros(len(points))
+        values, cumulative = self._weighted()
+        index = numpy.searchsorted(values, points, side="left")
+        below = numpy.where(index > 0, cumulative[index - 1], 0)
+        return below * self.count / cumulative[-1]
+
+
+class _CountedQuantiles(_Quantiles):
+    """Exact quantiles of integer values from their counts"""
+
+    def __init__(self, values: numpy.ndarray, counts: numpy.ndarray):
+        self.values = values.astype(numpy.float64)
+        self.cumulative = numpy.cumsum(counts)
+        self.count = int(self.cumulative[-1]) if len(counts) else 0
+
+    def _weighted(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        return self.values, self.cumulative
+
+
+class _QuantileSketch(_Quantiles):
+    """
+    KLL style quantile sketch. Values are kept in levels, where a value at
+    level h stands for 2**h values of the input. A level holding more than its
+    capacity is sorted and compacted: every other value, starting at a random
+    offset, is promoted to the next level. The memory is bounded by a few times
+    k values, the rank error is a small fraction of the total count, and two
+    sketches are merged by concatenating their levels.
+    """
+
+    # Large inputs are sorted in pieces of this size, such that the cost stays
+    # close to linear and the copies are bounded
+    block_size = 1 << 16
+
+    def __init__(self, k: int = 2048):
+        self.k = k
+        self.count = 0
+        self.levels: List[numpy.ndarray] = []
+        self._rng = numpy.random.default_rng()
+
+    def _capacity(self, level: int) -> int:
+        # Lower levels hold fewer values, the top level holds k values
+        depth = len(self.levels) - 1 - level
+        return max(int(self.k * (2 / 3) ** depth), 8)
+
+    def _add(self, level: int, values: numpy.ndarray):
+        while len(self.levels) <= level:
+            self.levels.append(numpy.zeros(0, dtype=numpy.float64))
+        self.levels[level] = numpy.concatenate([self.levels[level], values])
+
+    def _level(self, n: int) -> int:
+        # Level at which n sorted values are added directly, by keeping every
+        # 2**level-th value rather than by successive halving
+        return max(int(numpy.ceil(numpy.log2(n / self.k))), 0)
+
+    def fill(self, values: numpy.ndarray):
+        for start in range(0, len(values), self.block_size):
+            block = values[start : start + self.block_size]
+            self.count += len(block)
+            block = numpy.sort(block.astype(numpy.float64, copy=False))
+            step = 1 << self._level(len(block))
+            self._add(self._level(len(block)), block[self._rng.integers(step) :: step])
+            self._compress()
+
+    def fill_counts(self, values: numpy.ndarray, counts: numpy.ndarray):
+        """Filling sorted values with their counts, without repeating them"""
+        total = int(counts.sum())
+        if total == 0:
+            return
+        self.count += total
+        step = 1 << self._level(total)
+        ranks = numpy.arange(self._rng.integers(step), total, step)
+        index = numpy.searchsorted(numpy.cumsum(counts), ranks, side="right")
+        self._add(self._level(total), values[index].astype(numpy.float64))
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self._capacity(level):
+                values = numpy.sort(values)
+                # An odd value out stays at its level
+                keep = len(values) % 2
+                offset = int(self._rng.integers(2))
+                self.levels[level] = values[:keep]
+                self._add(level + 1, values[keep + offset :: 2])
+            level += 1
+
+    def merge(self, other: "_QuantileSketch"):
+        self.count += other.count
+        for level, values in enumerate(other.levels):
+            self._add(level, values)
+        self._compress()
+
+    def _weighted(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        # Sorted values and their cumulative weights
+        values = numpy.concatenate(self.levels)
+        weights = numpy.concatenate(
+            [numpy.full(len(v), 1 << level) for level, v in enumerate(self.levels)]
+        )
+        order = numpy.argsort(values)
+        return values[order], numpy.cumsum(weights[order])
+
+
+class StatsAccumulator:
+    """
+    Incremental version of the ArrayStats calculation. Chunks of an array are
+    added one at a time and only the running statistics are kept, such that
+    the memory usage is bounded by the chunk size rather than the array size.
+    """
+
+    def __init__(self, max_bins: int = 1024):
+        self.max_bins = max_bins
+        self.dtype: Optional[numpy.dtype] = None
+        self.count = 0
+        self.n_true = 0
+        # Value counts of integer arrays over [_int_low, _int_low + len), None if
+        # the value span is too wide to be counted. Counted integers give exact
+        # quantiles, and are only added to the sketch once they are dropped
+        self._int_low = 0
+        self._int_counts: Optional[numpy.ndarray] = numpy.zeros(0, numpy.int64)
+        # Running moments, merged with the pairwise update of Chan et al.
+        self.min = None
+        self.max = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.hist: Optional[_AdaptiveHistogram] = None
+        self.sketch: Optional[_QuantileSketch] = None
+        # Entries per number of elements, only filled for jagged arrays
+        self._multiplicity: Optional[numpy.ndarray] = None
+        # Every accumulated value, if the array is held in memory as a single
+        # buffer, giving exact histogram counts. Reset by further updates.
+        self.values: Optional[numpy.ndarray] = None
+
+    @property
+    def is_integer(self) -> bool:
+        return self.dtype is not None and numpy.issubdtype(self.dtype, numpy.integer)
+
+    def update(self, array: awkward.Array):
+        self.update_flat(flatten_content(array))
+        self.update_multiplicity(array)
+
+    def update_multiplicity(self, array: awkward.Array):
+        counts = list_counts(array)
+        if counts is not None:
+            self._multiplicity = _add_counts(self._multiplicity, numpy.bincount(counts))
+
+    def update_flat(self, flat: numpy.ndarray):
+        self.values = None
+        with span("summary") as record:
+            record.add_bytes(flat.nbytes)
+            self._fill(flat)
+
+    def _fill(self, flat: numpy.ndarray):
+        if self.dtype is None:
+            self.dtype = flat.dtype
+            # Integer values should never be split across bins
+            self.hist = _AdaptiveHistogram(
+                self.max_bins, min_exponent=0 if self.is_integer else None
+            )
+            self.sketch = _QuantileSketch()
+        if len(flat) == 0:
+            return
+        if flat.dtype == numpy.bool_:
+            self.count += len(flat)
+            self.n_true += int(numpy.count_nonzero(flat))
+            return
+
+        vmin, vmax = flat.min(), flat.max()
+        if self.is_integer:
+            self._update_int_counts(flat, int(vmin), int(vmax))
+        self._update_moments(
+            len(flat),
+            float(numpy.mean(flat, dtype=numpy.float64)),
+            float(numpy.var(flat, dtype=numpy.float64)) * len(flat),
+        )
+        self.min = vmin if self.min is None else min(self.min, vmin)
+        self.max = vmax if self.max is None else max(self.max, vmax)
+        finite = numpy.isfinite(flat)
+        if not finite.all():
+            flat = flat[finite]
+        self.hist.fill(flat)
+        if not self.is_integer or self._int_counts is None:
+            self.sketch.fill(flat)
+
+    def _update_moments(self, count: int, mean: float, m2: float):
+        total = self.count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def _update_int_counts(self, flat: numpy.ndarray, low: int, high: int):
+        if self._int_counts is None:
+            return
+        # The span is checked before anything is allocated, wide integer
+        # branches (event numbers) are never counted
+        first, last = low, high + 1
+        if len(self._int_counts):
+            first = min(first, self._int_low)
+            last = max(last, self._int_low + len(self._int_counts))
+        if last - first > _MAX_BINCOUNT_SPAN:
+            self._drop_int_counts()
+            return
+        counts = numpy.bincount((flat - low).astype(numpy.intp))
+        self._merge_int_counts(low, counts.astype(numpy.int64, copy=False))
+
+    def _drop_int_counts(self):
+        # Moving the counted values to the sketch, used from here on
+        if self._int_counts is not None:
+            self._sketch_counts(self._int_low, self._int_counts)
+        self._int_counts = None
+
+    def _sketch_counts(self, low: int, counts: numpy.ndarray):
+        values = numpy.nonzero(counts)[0]
+        self.sketch.fill_counts(values.astype(numpy.float64) + low, counts[values])
+
+    def _merge_int_counts(self, low: int, counts: Optional[numpy.ndarray]):
+        if counts is None:
+            self._drop_int_counts()
+            return
+        if self._int_counts is None:
+            self._sketch_counts(low, counts)
+            return
+        if len(counts) == 0:
+            return
+        if len(self._int_counts) == 0:
+            self._int_low, self._int_counts = low, counts.copy()
+            return
+        first = min(self._int_low, low)
+        last = max(self._int_low + len(self._int_counts), low + len(counts))
+        if last - first > _MAX_BINCOUNT_SPAN:
+            self._drop_int_counts()
+            self._sketch_counts(low, counts)
+            return
+        merged = numpy.zeros(last - first, dtype=numpy.int64)
+        for start, values in ((self._int_low, self._int_counts), (low, counts)):
+            merged[start - first : start - first + len(values)] += values
+        self._int_low, self._int_counts = first, merged
+
+    def merge(self, other: "StatsAccumulator"):
+        """Combining the statistics of another accumulator into this one"""
+        self.values = None
+        self._multiplicity = _add_counts(self._multiplicity, other._multiplicity)
+        if other.dtype is None:
+            return
+        if self.dtype is None:
+            self.dtype = other.dtype
+            self.hist = _AdaptiveHistogram(self.max_bins, other.hist.min_exponent)
+            self.sketch = _QuantileSketch()
+        if other.count == 0:
+            return
+        if self.dtype == numpy.bool_:
+            self.count += other.count
+            self.n_true += other.n_true
+            return
+        self.sketch.merge(other.sketch)
+        if self.is_integer:
+            self._merge_int_counts(other._int_low, other._int_counts)
+        self._update_moments(other.count, other._mean, other._m2)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.hist.merge(other.hist)
+
+    def finalize(self, bins: int = 40) -> ArrayStats:
+        stats = self._finalize_values(bins)
+        stats.multiplicity_counts = self._multiplicity
+        return stats
+
+    def _finalize_values(self, bins: int) -> ArrayStats:
+        if self.dtype == numpy.bool_:
+            stats = ArrayStats(ArraySummaryType.boolean, self.count)
+            stats.n_true = self.n_true
+            return stats
+
+        quantiles: Optional[_Quantiles] = self.sketch
+        if self.is_integer and self._int_counts is not None:
+            unique = numpy.nonzero(self._int_counts)[0]
+            counts = self._int_counts[unique]
+            # Offset in the dtype of the array, the low end of uint64 values
+            # may not fit an int64
+            unique = unique.astype(self.dtype) + self.dtype.type(self._int_low)
+            if classify_integers(unique) is ArraySummaryType.discrete:
+                stats = ArrayStats(ArraySummaryType.discrete, self.count)
+                stats.unique, stats.unique_counts = unique, counts
+                return stats
+            quantiles = _CountedQuantiles(unique, counts)
+
+        stats = ArrayStats(ArraySummaryType.continuous, self.count)
+        if self.count > 0:
+            stats.min, stats.max = self.min, self.max
+            stats.mean = self._mean
+            stats.std = float(numpy.sqrt(self._m2 / self.count))
+        if quantiles is not None and quantiles.count > 0:
+            stats.q1, stats.median, stats.q3 = (
+                float(q) for q in quantiles.quantiles([0.25, 0.5, 0.75])
+            )
+        edges, counts = self._histogram(stats, quantiles, bins)
+        stats.hist_centers = 0.5 * (edges[1:] + edges[:-1])
+        stats.hist_counts = counts
+        return stats
+
+    def _histogram(
+        self, stats: ArrayStats, quantiles: Optional[_Quantiles], bins: int
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Histogram of the finite values. The range is narrowed to the quantiles
+        of ROBUST_RANGE if the tails outside span more than the bulk of the
+        values, such that a few outliers do not squash the distribution into
+        a single bin. The values left out are counted as under/overflow.
+        """
+        if self.hist is None or quantiles is None or quantiles.count == 0:
+            return self._empty_hist()
+        low, high = (float(q) for q in quantiles.quantiles(ROBUST_RANGE))
+        full_span = len(self.hist.counts) * self.hist.width
+        if high <= low or full_span <= 2 * (high - low + self.hist.width):
+            return self.hist.rebin(bins)
+        if self.hist.n_bins(low, high) >= bins:
+            edges, counts, stats.underflow, stats.overflow = self.hist.rebin_range(
+                low, high, bins
+            )
+            return edges, counts
+        # The bins of the adaptive histogram are too coarse around the bulk,
+        # the values are binned again if at hand
+        edges = numpy.linspace(low, numpy.nextafter(high, numpy.inf), bins + 1)
+        if self.values is not None:
+            counts, _ = numpy.histogram(
+                self.values, bins=bins, range=(edges[0], edges[-1])
+            )
+            below = self.values[self.values < edges[0]]
+            above = self.values[self.values > edges[-1]]
+            stats.underflow = int(numpy.count_nonzero(numpy.isfinite(below)))
+            stats.overflow = int(numpy.count_nonzero(numpy.isfinite(above)))
+            return edges, counts
+        # Streamed values: the counts are estimated from the ranks of the
+        # quantiles, in steps of the sketch weights
+        ranks = numpy.round(quantiles.ranks(edges)).astype(numpy.int64)
+        stats.underflow = int(ranks[0])
+        stats.overflow = int(quantiles.count - ranks[-1])
+        stats.hist_approximate = True
+        return edges, numpy.diff(ranks)
+
+    @classmethod
+    def _empty_hist(cls) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        return numpy.array([]), numpy.array([], dtype=numpy.int64)
@@ -0,0 +1,148 @@
+import struct
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pyarrow
+
+# Header type of the record batch messages (MessageHeader union of Message.fbs)
+_RECORD_BATCH = 3
+
+# Layouts of the structs in the FlatBuffers vectors: Block (File.fbs), Buffer
+# and the int64 variadic buffer counts (Message.fbs)
+_BLOCK = "<qi4xq"
+_BUFFER = "<qq"
+_COUNT = "<q"
+
+
+class _Table:
+    """
+    Minimal reader of a FlatBuffers table, enough for the footer and the
+    message metadata of Arrow IPC files. Fields are accessed by their index in
+    the schema definition, unions taking up two indices (type and value).
+    """
+
+    def __init__(self, buf, pos: int):
+        self.buf = buf
+        self.pos = pos
+        self._vtable = pos - struct.unpack_from("<i", buf, pos)[0]
+        self._vtable_size = struct.unpack_from("<H", buf, self._vtable)[0]
+
+    @classmethod
+    def root(cls, buf) -> "_Table":
+        return cls(buf, struct.unpack_from("<I", buf, 0)[0])
+
+    def _field(self, index: int) -> Optional[int]:
+        entry = 4 + 2 * index
+        if entry >= self._vtable_size:
+            return None
+        offset = struct.unpack_from("<H", self.buf, self._vtable + entry)[0]
+        return self.pos + offset if offset else None
+
+    def _target(self, pos: int) -> int:
+        return pos + struct.unpack_from("<I", self.buf, pos)[0]
+
+    def scalar(self, index: int, fmt: str, default: int = 0) -> int:
+        pos = self._field(index)
+        return default if pos is None else struct.unpack_from(fmt, self.buf, pos)[0]
+
+    def table(self, index: int) -> Optional["_Table"]:
+        pos = self._field(index)
+        return None if pos is None else _Table(self.buf, self._target(pos))
+
+    def structs(self, index: int, fmt: str) -> List[tuple]:
+        pos = self._field(index)
+        if pos is None:
+            return []
+        start = self._target(pos)
+        length = struct.unpack_from("<I", self.buf, start)[0]
+        size = struct.calcsize(fmt)
+        return [
+            struct.unpack_from(fmt, self.buf, start + 4 + i * size)
+            for i in range(length)
+        ]
+
+
+def _num_buffers(data_type: "pyarrow.DataType", variadic: Iterator[int]) -> int:
+    """
+    Number of buffers of a field in a record batch, including its children.
+    Variadic buffers of the view types are counted from the batch metadata.
+    """
+    import pyarrow
+
+    types = pyarrow.types
+    if isinstance(data_type, pyarrow.ExtensionType):
+        return _num_buffers(data_type.storage_type, variadic)
+    if types.is_dictionary(data_type):
+        # The dictionary itself is stored in a separate message
+        return _num_buffers(data_type.index_type, variadic)
+    if types.is_null(data_type):
+        return 0
+    if types.is_string_view(data_type) or types.is_binary_view(data_type):
+        return 2 + next(variadic)
+    if data_type.num_fields == 0:
+        return len(pyarrow.nulls(0, data_type).buffers())
+
+    if types.is_union(data_type):
+        # Type ids, and offsets of the dense unions, without a validity buffer
+        own = 2 if data_type.mode == "dense" else 1
+    elif types.is_run_end_encoded(data_type):
+        own = 0
+    elif types.is_list_view(data_type) or types.is_large_list_view(data_type):
+        own = 3
+    elif types.is_fixed_size_list(data_type) or types.is_struct(data_type):
+        own = 1
+    else:  # Lists and maps: validity and offsets
+        own = 2
+    return own + sum(
+        _num_buffers(data_type.field(i).type, variadic)
+        for i in range(data_type.num_fields)
+    )
+
+
+def _uncompressed(body, offset: int, length: int, compressed: bool) -> int:
+    # Compressed buffers start with their uncompressed length, -1 if the
+    # buffer was left uncompressed
+    if not compressed or length == 0:
+        return length
+    size = struct.unpack_from("<q", body, offset)[0]
+    return length - 8 if size == -1 else size
+
+
+def read_layout(
+    source: "pyarrow.MemoryMappedFile", schema: "pyarrow.Schema"
+) -> List[Tuple[int, Dict[str, Tuple[int, int]]]]:
+    """
+    Number of rows and compressed and uncompressed bytes of each column, for
+    every record batch of the file. Only the footer and the message metadata
+    are parsed, the bodies of the batches are never decompressed.
+    """
+    import pyarrow
+
+    size = source.size()
+    # The file ends with the footer, its length and the ARROW1 magic
+    footer_length = struct.unpack("<i", source.read_at(4, size - 10))[0]
+    footer = _Table.root(source.read_at(footer_length, size - 10 - footer_length))
+
+    layout = []
+    for offset, _, _ in footer.structs(3, _BLOCK):
+        source.seek(offset)
+        message = pyarrow.ipc.read_message(source)
+        header = _Table.root(message.metadata)
+        if header.scalar(1, "<B") != _RECORD_BATCH:
+            raise ValueError(f"Block at {offset} is not a record batch")
+        batch = header.table(2)
+        buffers = iter(batch.structs(2, _BUFFER))
+        compressed = batch.table(3) is not None
+        variadic = iter(count for (count,) in batch.structs(4, _COUNT))
+        sizes = {}
+        for field in schema:
+            stored = unpacked = 0
+            for _ in range(_num_buffers(field.type, variadic)):
+                buffer_offset, length = next(buffers)
+                stored += length
+                unpacked += _uncompressed(
+                    message.body, buffer_offset, length, compressed
+                )
+            sizes[field.name] = (stored, unpacked)
+        layout.append((batch.scalar(0, "<q"), sizes))
+    return layout
@@ -0,0 +1,172 @@
+import concurrent.futures
+import csv
+import functools
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+from .column_cache import format_size
+from .file_scan import pick_tree
+from .lazy_array import LazyColumns
+from .readers import open_reader
+from .streaming import stream_stats
+
+# Statistics written as individual columns in the CSV output
+_CSV_FIELDS = [
+    "branch",
+    "summary_type",
+    "count",
+    "n_true",
+    "min",
+    "max",
+    "mean",
+    "std",
+    "median",
+    "q1",
+    "q3",
+    "underflow",
+    "overflow",
+    "mode",
+    "entries",
+    "compressed_bytes",
+    "uncompressed_bytes",
+    "seconds",
+    "error",
+]
+
+
+@functools.lru_cache(maxsize=4)
+def _open_columns(file_path: str, tree_path: str) -> LazyColumns:
+    # Each worker process keeps its own handle to the file
+    return LazyColumns(open_reader(file_path).tree(tree_path))
+
+
+def summarize_branch(
+    file_path: str, tree_path: str, name: str, chunk_size: int
+) -> Dict:
+    """Streaming a single branch once and returning its summary record"""
+    start = time.perf_counter()
+    columns = _open_columns(file_path, tree_path)
+    branch = columns.branch(name)
+    record = {
+        "branch": name,
+        "entries": int(branch.num_entries),
+        "compressed_bytes": int(branch.compressed_bytes),
+        "uncompressed_bytes": int(branch.uncompressed_bytes),
+    }
+    try:
+        stats = stream_stats(f"array[{name!r}]", columns, chunk_size).finalize()
+        record["stats"] = stats.to_dict()
+        record["stats"]["mode"] = None if stats.mode is None else stats.mode.item()
+    except Exception as err:  # Branches that cannot be summarized are reported
+        record["error"] = f"{type(err).__name__}: {err}"
+    record["seconds"] = time.perf_counter() - start
+    return record
+
+
+def find_tree(file_path: str, tree_path: Optional[str] = None) -> str:
+    """Path of the requested tree, or of the largest tree if not given"""
+    with open_reader(file_path) as reader:
+        info = pick_tree(reader.scan(), tree_path)
+    if info is None and not tree_path:
+        raise ValueError(f"No tree found in {file_path}")
+    if info is None:
+        raise ValueError(f"Tree {tree_path} not found in {file_path}")
+    return info.path
+
+
+def run_batch(
+    file_path: str,
+    tree_path: Optional[str],
+    workers: int = 1,
+    chunk_size: int = 1_000_000,
+) -> Dict:
+    """
+    Summarizing every branch of the tree without a terminal interface. Branches
+    are distributed over a process pool, each branch is streamed once in
+    chunks of entries.
+    """
+    tree_path = find_tree(file_path, tree_path)
+    columns = _open_columns(file_path, tree_path)
+    names = columns.fields
+    # Events of the tree, every branch holds all of them
+    entries = int(columns.num_entries)
+    start = time.perf_counter()
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            jobs = [
+                pool.submit(summarize_branch, file_path, tree_path, n, chunk_size)
+                for n in names
+            ]
+            records = [job.result() for job in jobs]
+    else:
+        records = [summarize_branch(file_path, tree_path, n, chunk_size) for n in names]
+    elapsed = time.perf_counter() - start
+
+    compressed = sum(r["compressed_bytes"] for r in records)
+    return {
+        "file": file_path,
+        "tree": tree_path,
+        "branches": records,
+        "throughput": {
+            "seconds": elapsed,
+            "workers": workers,
+            "entries": entries,
+            "events_per_second": entries / elapsed if elapsed else None,
+            "mb_per_second": compressed / 1e6 / elapsed if elapsed else None,
+            "compressed_bytes": compressed,
+            "uncompressed_bytes": sum(r["uncompressed_bytes"] for r in records),
+        },
+    }
+
+
+def _csv_rows(result: Dict) -> List[Dict]:
+    rows = []
+    for record in result["branches"]:
+        row = {k: record.get(k) for k in _CSV_FIELDS}
+        for key, value in record.get("stats", {}).items():
+            if key in _CSV_FIELDS:
+                row[key] = value
+        stats = record.get("stats", {})
+        # Histogram and unique counts are stored as space separated lists
+        for key in ["unique", "unique_counts", "hist_centers", "hist_counts"]:
+            values = stats.get(key)
+            row[key] = "" if values is None else " ".join(str(v) for v in values)
+        rows.append(row)
+    return rows
+
+
+def write_batch(result: Dict, output: str):
+    """Writing the batch results as CSV if requested by the suffix, else JSON"""
+    if output.endswith(".csv"):
+        rows = _csv_rows(result)
+        with open(output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+def _format_rate(rate: Optional[float]) -> str:
+    # Rates are None if the run took no measurable time
+    return "n/a" if rate is None else f"{rate:.3g}"
+
+
+def main_batch(
+    file_path: str, tree_path: Optional[str], output: str, workers: int, chunk_size: int
+) -> int:
+    result = run_batch(file_path, tree_path, workers=workers, chunk_size=chunk_size)
+    write_batch(result, output)
+    rate = result["throughput"]
+    n_failed = sum("error" in r for r in result["branches"])
+    print(
+        f"Summarized {len(result['branches'])} branches ({n_failed} failed) in "
+        f"{rate['seconds']:.2f}s: {_format_rate(rate['events_per_second'])} "
+        f"events/s, {_format_rate(rate['mb_per_second'])} MB/s "
+        f"({format_size(rate['compressed_bytes'])} compressed)",
+        file=sys.stderr,
+    )
+    return 1 if n_failed else 0
@@ -0,0 +1,125 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Name parts of the branch paths: collections (Jet_pt), nested records
+# (Muon.pt), and the members of split objects (evt/fX)
+_TOKEN = re.compile(r"[^/_.]+")
+
+# Character separating the group name from the query in a scoped search
+SCOPE_SEPARATOR = ":"
+
+
+class BranchGroup:
+    """
+    Branches sharing a name prefix, such as the Jet_* branches of a NanoAOD
+    collection or the members of a split object. Entries are the branches
+    directly in the group and the sub-groups, in the order of the tree. Groups
+    start collapsed.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.entries: List[Union[str, "BranchGroup"]] = []
+        self.expanded = False
+        self._names: Optional[List[str]] = None
+        self._lookup: Optional[Dict[str, "BranchGroup"]] = None
+
+    def __repr__(self):
+        return f"<BranchGroup {self.label!r} ({len(self)} branches)>"
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def names(self) -> List[str]:
+        """All branches in the group and its sub-groups"""
+        if self._names is None:
+            self._names = []
+            for entry in self.entries:
+                if isinstance(entry, BranchGroup):
+                    self._names.extend(entry.names)
+                else:
+                    self._names.append(entry)
+        return self._names
+
+    def groups(self) -> Iterator["BranchGroup"]:
+        for entry in self.entries:
+            if isinstance(entry, BranchGroup):
+                yield entry
+                yield from entry.groups()
+
+    def find(self, label: str) -> Optional["BranchGroup"]:
+        """Sub-group by label, ignoring the case and trailing separators"""
+        if self._lookup is None:
+            self._lookup = {g.label.lower(): g for g in self.groups()}
+        return self._lookup.get(label.rstrip("/_.").lower())
+
+    def rows(self, depth: int = 0) -> List[Tuple[int, Union[str, "BranchGroup"]]]:
+        """
+        Entries as displayed in the list with their nesting depth. Only the
+        expanded groups are descended into, such that the number of rows is
+        that of the visible entries.
+        """
+        rows: List[Tuple[int, Union[str, BranchGroup]]] = []
+        for entry in self.entries:
+            rows.append((depth, entry))
+            if isinstance(entry, BranchGroup) and entry.expanded:
+                rows.extend(entry.rows(depth + 1))
+        return rows
+
+
+class _Node:
+    __slots__ = ("label", "names", "children")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.names: List[str] = []
+        self.children: Dict[str, "_Node"] = {}
+
+
+def group_branches(keys: Iterable[str], min_size: int = 3) -> BranchGroup:
+    """
+    Prefix tree of the branch paths, split at '/', '_' and '.'. Prefixes
+    shared by fewer than min_size branches are not grouped, and a group whose
+    only entry is a sub-group is replaced by it, such that HLT_IsoMu24_* is not
+    nested below an HLT group of its own. The leaves are the branch names as
+    accepted by LazyColumns (the last part of the path).
+    """
+    root = _Node("")
+    for key in keys:
+        node = root
+        previous, previous_end = "", -1
+        for match in _TOKEN.finditer(key):
+            token = match.group()
+            # Members of split objects may repeat the name of the parent branch
+            # (evt/evt.fX)
+            if previous_end >= 0 and key[previous_end] == "/" and token == previous:
+                previous_end = match.end()
+                continue
+            child = node.children.get(token)
+            if child is None:
+                child = node.children[token] = _Node(key[: match.end()])
+            node = child
+            previous, previous_end = token, match.end()
+        node.names.append(key.split("/")[-1])
+
+    group = BranchGroup("")
+    group.entries = _entries(root, min_size)
+    return group
+
+
+def _entries(node: _Node, min_size: int) -> List[Union[str, BranchGroup]]:
+    entries: List[Union[str, BranchGroup]] = list(node.names)
+    for child in node.children.values():
+        sub = _entries(child, min_size)
+        size = sum(len(e) if isinstance(e, BranchGroup) else 1 for e in sub)
+        if size < min_size:
+            # Too small to be grouped, so also without sub-groups
+            entries.extend(sub)
+        elif len(sub) == 1 and isinstance(sub[0], BranchGroup):
+            entries.append(sub[0])
+        else:
+            group = BranchGroup(child.label)
+            group.entries = sub
+            entries.append(group)
+    return entries
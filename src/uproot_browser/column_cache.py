@@ -0,0 +1,117 @@
+import collections
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_SIZE_UNITS = {"": 1, "k": 10**3, "m": 10**6, "g": 10**9, "t": 10**12}
+
+
+def parse_size(text: str) -> int:
+    """Parsing human readable sizes such as 4GB, 512MiB or 1e9 into bytes"""
+    match = re.fullmatch(r"\s*([0-9.eE+]+)\s*([kKmMgGtT]?)(i?)[bB]?\s*", text)
+    if match is None:
+        raise ValueError(f"Cannot parse size {text}")
+    value, unit, binary = match.groups()
+    scale = _SIZE_UNITS[unit.lower()]
+    if binary and unit:
+        scale = 1024 ** ("kmgt".index(unit.lower()) + 1)
+    return int(float(value) * scale)
+
+
+def format_size(nbytes: float) -> str:
+    for unit in ["B", "kB", "MB", "GB"]:
+        if abs(nbytes) < 1000:
+            return f"{nbytes:.3g}{unit}"
+        nbytes /= 1000
+    return f"{nbytes:.3g}TB"
+
+
+def _nbytes(value: Any) -> int:
+    # Awkward arrays include the offsets and index buffers in nbytes
+    return int(getattr(value, "nbytes", 0))
+
+
+class ColumnCache:
+    """
+    Least-recently-used store of loaded columns and evaluated expressions,
+    bounded by the total nbytes of the stored arrays. Items larger than the
+    whole budget are returned but never stored. A max_bytes of None disables
+    the budget.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._store: collections.OrderedDict[Hashable, Any] = collections.OrderedDict()
+        self._lock = threading.RLock()
+        # Items currently being computed, used to avoid reading a column twice
+        self._pending: Dict[Hashable, threading.Event] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def peek(self, key: Hashable) -> Any:
+        """Stored value without updating the usage order, None if missing"""
+        return self._store.get(key)
+
+    def fits(self, nbytes: int) -> bool:
+        """Whether an item of this size can be stored without evictions"""
+        return self.max_bytes is None or self.nbytes + nbytes <= self.max_bytes
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                if key in self._store:
+                    self.hits += 1
+                    self._store.move_to_end(key)
+                    return self._store[key]
+                pending = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    pending = self._pending[key] = threading.Event()
+                    break
+            # Another thread is computing the same item, using its result (or
+            # computing it here if that thread failed or was cancelled)
+            pending.wait()
+
+        # Computing outside the lock, such that other columns can be looked up
+        try:
+            value = compute()
+            self.put(key, value)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        size = _nbytes(value)
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            if key in self._store:
+                self.nbytes -= _nbytes(self._store.pop(key))
+            self._store[key] = value
+            self.nbytes += size
+            while self.max_bytes is not None and self.nbytes > self.max_bytes:
+                _, evicted = self._store.popitem(last=False)
+                self.nbytes -= _nbytes(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+            self.nbytes = 0
+
+    def summary(self) -> str:
+        budget = "∞" if self.max_bytes is None else format_size(self.max_bytes)
+        return (
+            f"{format_size(self.nbytes)}/{budget} "
+            f"hit {self.hits} miss {self.misses} evict {self.evictions}"
+        )
@@ -0,0 +1,160 @@
+import ast
+import copy
+import functools
+from typing import List, Optional
+
+import awkward
+import numpy
+
+from .column_cache import ColumnCache
+from .instrument import span
+
+# Modules that can be used in the plot definition alongside the array
+NAMESPACE = {"awkward": awkward, "ak": awkward, "numpy": numpy, "np": numpy}
+
+# Name of the columns object within the plot definition
+ARRAY_NAME = "array"
+
+# Sub-expression types whose results are worth keeping between evaluations
+_MEMO_NODES = (
+    ast.Subscript,
+    ast.Attribute,
+    ast.Compare,
+    ast.BinOp,
+    ast.BoolOp,
+    ast.UnaryOp,
+    ast.Call,
+)
+# Nodes that introduce their own variables, which are never memoized
+_SCOPE_NODES = (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+def _uses_array(node: ast.AST) -> bool:
+    return any(
+        isinstance(n, ast.Name) and n.id == ARRAY_NAME for n in ast.walk(node)
+    ) and not any(isinstance(n, _SCOPE_NODES) for n in ast.walk(node))
+
+
+def _branch_name(node: ast.AST) -> Optional[str]:
+    """Branch referenced by an array['x'] or array.x node"""
+    if isinstance(node, ast.Subscript):
+        if isinstance(node.value, ast.Name) and node.value.id == ARRAY_NAME:
+            if isinstance(node.slice, ast.Constant) and isinstance(
+                node.slice.value, str
+            ):
+                return node.slice.value
+    if isinstance(node, ast.Attribute):
+        if isinstance(node.value, ast.Name) and node.value.id == ARRAY_NAME:
+            return node.attr
+    return None
+
+
+class _Normalize(ast.NodeTransformer):
+    # array.x and array['x'] should share the same cache key
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        name = _branch_name(node)
+        if name is not None:
+            return ast.Subscript(
+                value=node.value, slice=ast.Constant(name), ctx=ast.Load()
+            )
+        return self.generic_visit(node)
+
+
+def node_key(node: ast.AST) -> str:
+    return ast.dump(_Normalize().visit(copy.deepcopy(node)))
+
+
+class _MemoTransformer(ast.NodeTransformer):
+    """Wrapping every sub-expression that uses the array in __memo__(key, lambda)"""
+
+    def visit(self, node: ast.AST) -> ast.AST:
+        if isinstance(node, _SCOPE_NODES):
+            return node
+        # Keys are taken from the sub-expression before it is transformed
+        # Plain branch lookups are already cached by the columns themselves
+        key = None
+        if (
+            isinstance(node, _MEMO_NODES)
+            and _uses_array(node)
+            and _branch_name(node) is None
+        ):
+            key = node_key(node)
+        node = super().visit(node)
+        if key is not None:
+            call = ast.Call(
+                func=ast.Name(id="__memo__", ctx=ast.Load()),
+                args=[
+                    ast.Constant(key),
+                    ast.Lambda(
+                        args=ast.arguments(
+                            posonlyargs=[],
+                            args=[],
+                            kwonlyargs=[],
+                            kw_defaults=[],
+                            defaults=[],
+                        ),
+                        body=node,
+                    ),
+                ],
+                keywords=[],
+            )
+            return ast.copy_location(call, node)
+        return node
+
+
+class PlotExpression:
+    """
+    Parsed plot definition. The branches referenced as array['x'] or array.x
+    are extracted from the syntax tree, such that they can be read up front,
+    and the expression is also compiled into a form where each sub-expression
+    is looked up in a memo (see ColumnCache.get) before being evaluated.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tree = ast.parse(source.strip(), mode="eval")
+        self.key = node_key(self.tree.body)
+        self.code = compile(self.tree, "<plot definition>", "eval")
+        memo_tree = ast.fix_missing_locations(
+            _MemoTransformer().visit(copy.deepcopy(self.tree))
+        )
+        self.memo_code = compile(memo_tree, "<plot definition>", "eval")
+
+    @property
+    def branch(self) -> Optional[str]:
+        """Branch name if the definition is a plain branch lookup"""
+        return _branch_name(self.tree.body)
+
+    @property
+    def branches(self) -> List[str]:
+        names = []
+        for node in ast.walk(self.tree):
+            name = _branch_name(node)
+            if name is not None and name not in names:
+                names.append(name)
+        return names
+
+
+@functools.lru_cache(maxsize=128)
+def parse(source: str) -> PlotExpression:
+    return PlotExpression(source)
+
+
+def evaluate(
+    expression: str, array, memo: Optional[ColumnCache] = None
+) -> awkward.Array:
+    """
+    Evaluating a plot definition, with `array` referring to the columns. The
+    memo should be cleared whenever the underlying columns change.
+    """
+    parsed = parse(expression)
+    namespace = dict(NAMESPACE)
+    namespace[ARRAY_NAME] = array
+    with span("eval", expression=expression) as record:
+        if memo is None:
+            result = eval(parsed.code, namespace)
+        else:
+            namespace["__memo__"] = memo.get
+            result = eval(parsed.memo_code, namespace)
+        record.add_bytes(getattr(result, "nbytes", 0))
+    return result
@@ -0,0 +1,162 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import uproot
+
+# Class names of the tree-like objects that are listed
+TREE_CLASSNAMES = {"TTree": "TTree", "ROOT::RNTuple": "RNTuple"}
+
+
+class BranchInfo:
+    """Metadata of a single branch or field, known without reading any basket"""
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        num_entries: int,
+        typename: str,
+        interpretation: str,
+        compressed_bytes: Optional[int] = None,
+        uncompressed_bytes: Optional[int] = None,
+    ):
+        self.name = name
+        self.path = path
+        self.num_entries = num_entries
+        self.typename = typename
+        self.interpretation = interpretation
+        # Sizes are not available for every format
+        self.compressed_bytes = compressed_bytes
+        self.uncompressed_bytes = uncompressed_bytes
+
+
+class TreeInfo:
+    """Metadata of a tree-like object, with its branches keyed by display name"""
+
+    def __init__(self, path: str, kind: str, num_entries: int):
+        self.path = path
+        self.kind = kind
+        self.num_entries = num_entries
+        self.branches: Dict[str, BranchInfo] = {}
+
+    @property
+    def compressed_bytes(self) -> Optional[int]:
+        return self._total("compressed_bytes")
+
+    @property
+    def uncompressed_bytes(self) -> Optional[int]:
+        return self._total("uncompressed_bytes")
+
+    def _total(self, attr: str) -> Optional[int]:
+        sizes = [getattr(b, attr) for b in self.branches.values()]
+        if any(size is None for size in sizes):
+            return None
+        return sum(sizes)
+
+    def sizes(self) -> Dict[str, Optional[int]]:
+        """Expected number of bytes read from disk for each branch"""
+        return {name: b.compressed_bytes for name, b in self.branches.items()}
+
+
+def _interpretation(branch) -> str:
+    # Branches of unsupported types raise on access of the interpretation
+    try:
+        return str(branch.interpretation)
+    except Exception:  # Reporting rather than failing the scan
+        return "unknown"
+
+
+def scan_ttree(path: str, ttree: "uproot.TTree") -> TreeInfo:
+    info = TreeInfo(path, "TTree", ttree.num_entries)
+    for key, branch in ttree.iteritems(recursive=True):
+        name = key.split("/")[-1]
+        info.branches[name] = BranchInfo(
+            name,
+            key,
+            branch.num_entries,
+            branch.typename,
+            _interpretation(branch),
+            compressed_bytes=branch.compressed_bytes,
+            uncompressed_bytes=branch.uncompressed_bytes,
+        )
+    return info
+
+
+def rntuple_sizes(rntuple) -> Dict[str, Tuple[int, int]]:
+    """
+    Compressed and uncompressed bytes of the pages of each top-level field,
+    summed from the page lists of the footer without reading any page.
+    """
+    fields = rntuple.field_records
+    columns = rntuple.column_records
+
+    def top_name(field_id: int) -> str:
+        # Top-level fields are their own parent
+        while fields[field_id].parent_field_id != field_id:
+            field_id = fields[field_id].parent_field_id
+        return fields[field_id].field_name
+
+    compressed: Dict[str, int] = {}
+    bits: Dict[str, int] = {}
+    for cluster in rntuple.page_link_list:
+        for column, column_pages in zip(columns, cluster):
+            name = top_name(column.field_id)
+            for page in column_pages.pages:
+                compressed[name] = compressed.get(name, 0) + page.locator.num_bytes
+                bits[name] = bits.get(name, 0) + abs(page.num_elements) * column.nbits
+    return {name: (compressed[name], bits[name] // 8) for name in compressed}
+
+
+def scan_rntuple(path: str, rntuple) -> TreeInfo:
+    info = TreeInfo(path, "RNTuple", rntuple.num_entries)
+    try:
+        sizes = rntuple_sizes(rntuple)
+    except Exception:  # Sizes are only informative, listing the fields regardless
+        sizes = {}
+    for key in rntuple.keys():
+        field = rntuple[key]
+        name = key.split("/")[-1]
+        # Fields without any page hold no data
+        compressed, uncompressed = sizes.get(name, (0, 0) if sizes else (None, None))
+        info.branches[name] = BranchInfo(
+            name,
+            key,
+            rntuple.num_entries,
+            field.typename,
+            field.typename,
+            compressed_bytes=compressed,
+            uncompressed_bytes=uncompressed,
+        )
+    return info
+
+
+def scan_file(uproot_file: "uproot.ReadOnlyDirectory") -> List[TreeInfo]:
+    """
+    Listing every TTree and RNTuple of the file, including those in
+    subdirectories. Only the directory records and the tree metadata are read,
+    the baskets and pages are left untouched.
+    """
+    trees = []
+    for path, classname in uproot_file.classnames(cycle=False).items():
+        kind = TREE_CLASSNAMES.get(classname)
+        if kind == "TTree":
+            trees.append(scan_ttree(path, uproot_file[path]))
+        elif kind == "RNTuple":
+            trees.append(scan_rntuple(path, uproot_file[path]))
+    return trees
+
+
+def pick_tree(
+    trees: List[TreeInfo], preferred: Optional[str] = None
+) -> Optional[TreeInfo]:
+    """
+    Tree at the preferred path, None if it does not exist. Without a preferred
+    path (None or empty), the tree with the most data is picked, as it is most
+    likely the one holding the events.
+    """
+    if preferred:
+        preferred = preferred.split(";")[0].strip("/")
+        return next((t for t in trees if t.path == preferred), None)
+    if not trees:
+        return None
+    return max(trees, key=lambda t: (t.uncompressed_bytes or 0, t.num_entries))
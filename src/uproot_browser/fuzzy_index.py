@@ -0,0 +1,64 @@
+import re
+from typing import Dict, List
+
+import numpy
+
+
+class FuzzyIndex:
+    """
+    Fuzzy (subsequence) matcher over a fixed list of names. The lower-case
+    characters of each name are indexed up front, such that only names that
+    contain every character of the query are tested against the matching
+    regular expression. When a query extends the previous one, only the
+    previous matches are tested again.
+
+    Results are ranked the same way as fuzzyfinder: shortest matched span,
+    then earliest match position, then the name itself.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = list(names)
+        self._lower = [n.lower() for n in self.names]
+        # Boolean mask of which names contains a given character
+        self._char_masks: Dict[str, numpy.ndarray] = {}
+        for idx, name in enumerate(self._lower):
+            for char in set(name):
+                if char not in self._char_masks:
+                    self._char_masks[char] = numpy.zeros(len(self.names), dtype=bool)
+                self._char_masks[char][idx] = True
+        # State of the last query, used for incremental narrowing
+        self._last_query = ""
+        self._last_matches = list(range(len(self.names)))
+
+    def _candidates(self, query: str) -> List[int]:
+        if self._last_query and query.startswith(self._last_query):
+            return self._last_matches
+        mask = numpy.ones(len(self.names), dtype=bool)
+        for char in set(query):
+            if char not in self._char_masks:
+                return []
+            mask &= self._char_masks[char]
+        return numpy.nonzero(mask)[0].tolist()
+
+    def match(self, query: str) -> List[str]:
+        query = query.lower()
+        if query == "":
+            self._last_query, self._last_matches = "", list(range(len(self.names)))
+            return self.names
+
+        pattern = "(?=({}))".format(".*?".join(map(re.escape, query)))
+        regex = re.compile(pattern)
+        ranked = []
+        for idx in self._candidates(query):
+            spans = [
+                (len(m.group(1)), m.start()) for m in regex.finditer(self._lower[idx])
+            ]
+            if not spans:
+                continue
+            length, start = min(spans)
+            ranked.append((length, start, self.names[idx], idx))
+        ranked.sort()
+
+        self._last_query = query
+        self._last_matches = sorted(r[3] for r in ranked)
+        return [r[2] for r in ranked]
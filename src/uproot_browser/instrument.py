@@ -0,0 +1,123 @@
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List
+
+
+class Span:
+    """Timing of a single instrumented section of code"""
+
+    __slots__ = ("name", "args", "start", "duration", "nbytes", "allocated", "thread")
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+        self.duration = 0.0
+        self.nbytes = 0
+        self.allocated = 0
+        self.thread = threading.get_ident()
+
+    def add_bytes(self, nbytes: int):
+        self.nbytes += int(nbytes)
+
+
+class Recorder:
+    """
+    Collecting timed spans around the hot paths: file open, branch reads,
+    expression evaluation, summary statistics and figure rendering. Totals are
+    kept per span name, while the most recent spans are kept individually for
+    the trace output. Allocations are only counted while tracemalloc is
+    tracing, and include the allocations of all threads during the span.
+    """
+
+    def __init__(self, max_spans: int = 100_000):
+        self.enabled = True
+        self.spans: collections.deque[Span] = collections.deque(maxlen=max_spans)
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args) -> Iterator[Span]:
+        record = Span(name, args)
+        if not self.enabled:
+            yield record
+            return
+        tracing = tracemalloc.is_tracing()
+        memory = tracemalloc.get_traced_memory()[0] if tracing else 0
+        record.start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - record.start
+            if tracing:
+                record.allocated = max(tracemalloc.get_traced_memory()[0] - memory, 0)
+            self._add(record)
+
+    def _add(self, record: Span):
+        with self._lock:
+            self.spans.append(record)
+            total = self.totals.setdefault(
+                record.name,
+                {"count": 0, "seconds": 0.0, "max": 0.0, "bytes": 0, "allocated": 0},
+            )
+            total["count"] += 1
+            total["seconds"] += record.duration
+            total["max"] = max(total["max"], record.duration)
+            total["bytes"] += record.nbytes
+            total["allocated"] += record.allocated
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.totals.clear()
+
+    def table(self) -> List[Dict[str, Any]]:
+        """Totals per span name, slowest first"""
+        with self._lock:
+            rows = [dict(name=name, **total) for name, total in self.totals.items()]
+        return sorted(rows, key=lambda r: r["seconds"], reverse=True)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans in the Chrome trace event format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        for record in spans:
+            args = {k: str(v) for k, v in record.args.items()}
+            args.update(bytes=record.nbytes, allocated=record.allocated)
+            events.append(
+                {
+                    "name": record.name,
+                    "ph": "X",
+                    "ts": (record.start - self._origin) * 1e6,
+                    "dur": record.duration * 1e6,
+                    "pid": pid,
+                    "tid": record.thread,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+# Shared recorder of the application, span is used to instrument code sections
+recorder = Recorder()
+span = recorder.span
+
+
+def trace_allocations(enabled: bool = True):
+    """Starting or stopping the allocation tracing used by the span counters"""
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
@@ -0,0 +1,240 @@
+import concurrent.futures
+import copy
+from typing import Callable, Dict, List, Optional, Tuple
+
+import awkward
+import numpy
+import uproot
+
+from .column_cache import ColumnCache
+from .instrument import span
+
+# Signature of the progress callback: (branch name, entries read, total entries)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class LoadCancelled(Exception):
+    """Raised by a progress callback to abort a read between baskets"""
+
+
+class LazyColumns:
+    """
+    Dictionary-like access to the branches of a tree. Only the branch metadata
+    is inspected on construction, the baskets of a branch are read the first
+    time the branch is requested and kept in the column cache for reuse.
+    """
+
+    # Maximum number of progress reports for a single branch read
+    max_read_steps = 100
+
+    def __init__(self, ttree: uproot.TTree, cache: Optional[ColumnCache] = None):
+        self.ttree = ttree
+        # Mapping the display name to the full path of the branch in the tree
+        self._paths: Dict[str, str] = {f.split("/")[-1]: f for f in ttree.keys()}
+        # Loaded columns, the cache may be shared with the expression memo
+        self.cache = cache if cache is not None else ColumnCache()
+        self.progress: Optional[ProgressCallback] = None
+        # Optional pool used to read groups of baskets concurrently
+        self.executor: Optional[concurrent.futures.Executor] = None
+        # Columns held by the view itself, see pinned
+        self._pinned: Dict[str, awkward.Array] = {}
+
+    def monitored(self, progress: Optional[ProgressCallback]) -> "LazyColumns":
+        """
+        Returning a view that shares the loaded columns, but reports reads to
+        the given callback instead.
+        """
+        view = copy.copy(self)
+        view.progress = progress
+        return view
+
+    def pinned(self, names: List[str]) -> "LazyColumns":
+        """
+        Returning a view holding the given columns for as long as it is used.
+        Columns larger than the cache budget are never stored in the cache,
+        and would otherwise be read again on every access.
+        """
+        view = copy.copy(self)
+        view._pinned = dict(self._pinned)
+        for name in names:
+            if name in self:
+                view._pinned[name] = self[name]
+        return view
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._paths.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._paths
+
+    def __getitem__(self, name: str) -> awkward.Array:
+        if name not in self._paths:
+            raise KeyError(f"Branch {name} does not exist in tree")
+        if name in self._pinned:
+            return self._pinned[name]
+        return self.cache.get(("branch", name), lambda: self._read_branch(name))
+
+    def __getattr__(self, name: str) -> awkward.Array:
+        # Allowing the array.branch syntax for plot definitions
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError as err:
+            raise AttributeError(name) from err
+
+    def is_loaded(self, name: str) -> bool:
+        return ("branch", name) in self.cache
+
+    def loaded(self, name: str) -> Optional[awkward.Array]:
+        """Column if it is currently held in the cache, without reading it"""
+        return self.cache.peek(("branch", name))
+
+    def branch(self, name: str) -> uproot.TBranch:
+        return self.ttree[self._paths[name]]
+
+    def counter(self, name: str) -> Optional[str]:
+        """Branch holding the number of elements per entry of a jagged branch"""
+        count_branch = getattr(self.branch(name), "count_branch", None)
+        if count_branch is None:
+            return None
+        counter = count_branch.name.split("/")[-1]
+        return counter if counter in self else None
+
+    @property
+    def num_entries(self) -> int:
+        return self.ttree.num_entries
+
+    def entry_ranges(self, chunk_size: int) -> List[Tuple[int, int]]:
+        """Splitting the tree into ranges of at most chunk_size entries"""
+        total = self.num_entries
+        return [
+            (start, min(start + chunk_size, total))
+            for start in range(0, total, chunk_size)
+        ]
+
+    def sample_ranges(self, names: List[str], n_baskets: int) -> List[Tuple[int, int]]:
+        """
+        Entry ranges of a spread-out sample of baskets: the first basket and
+        baskets evenly spaced across the tree. The basket layout is taken from
+        the first listed branch.
+        """
+        names = [n for n in names if n in self]
+        if names:
+            offsets = list(self.branch(names[0]).entry_offsets)
+        else:
+            offsets = [r[0] for r in self.entry_ranges(100_000)] + [self.num_entries]
+        n_total = len(offsets) - 1
+        if n_total <= 0:
+            return []
+        picks = sorted(set(numpy.linspace(0, n_total - 1, n_baskets).astype(int)))
+        return [(offsets[i], offsets[i + 1]) for i in picks]
+
+    def range_view(self, start: int, stop: int) -> "RangeColumns":
+        return RangeColumns(self, start, stop)
+
+    def _entry_ranges(self, branch: uproot.TBranch) -> List[Tuple[int, int]]:
+        # Grouping baskets such that there are at most max_read_steps reads
+        offsets = list(branch.entry_offsets)
+        if len(offsets) < 2:
+            return [(0, branch.num_entries)]
+        step = max(1, (len(offsets) - 1) // self.max_read_steps)
+        bounds = offsets[::step]
+        if bounds[-1] != offsets[-1]:
+            bounds.append(offsets[-1])
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _read_branch(self, name: str) -> awkward.Array:
+        with span("read", branch=name) as record:
+            array = self._read_baskets(name)
+            record.add_bytes(array.nbytes)
+        return array
+
+    def _read_baskets(self, name: str) -> awkward.Array:
+        branch = self.branch(name)
+        if self.progress is None:
+            return branch.array()
+
+        ranges = self._entry_ranges(branch)
+        total = ranges[-1][1]
+        self.progress(name, 0, total)
+        parts = []
+        if self.executor is None:
+            for start, stop in ranges:
+                parts.append(branch.array(entry_start=start, entry_stop=stop))
+                self.progress(name, stop, total)
+        else:
+            jobs = [
+                self.executor.submit(branch.array, entry_start=start, entry_stop=stop)
+                for start, stop in ranges
+            ]
+            try:
+                for (_, stop), job in zip(ranges, jobs):
+                    parts.append(job.result())
+                    self.progress(name, stop, total)
+            finally:
+                for job in jobs:
+                    job.cancel()
+        return parts[0] if len(parts) == 1 else awkward.concatenate(parts)
+
+
+class RangeColumns:
+    """
+    Dictionary-like access to an entry range of the tree. Branches are read for
+    the range only and are discarded with the view, unless the full branch is
+    already held in the column cache of the parent.
+    """
+
+    def __init__(self, parent: LazyColumns, start: int, stop: int):
+        self.parent = parent
+        self.start = start
+        self.stop = stop
+        self._columns: Dict[str, awkward.Array] = {}
+
+    @property
+    def fields(self) -> List[str]:
+        return self.parent.fields
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.parent
+
+    def __getitem__(self, name: str) -> awkward.Array:
+        if name not in self.parent:
+            raise KeyError(f"Branch {name} does not exist in tree")
+        if name not in self._columns:
+            self._columns[name] = self._read(name)
+        return self._columns[name]
+
+    def __getattr__(self, name: str) -> awkward.Array:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError as err:
+            raise AttributeError(name) from err
+
+    def preload(
+        self,
+        names: List[str],
+        executor: Optional[concurrent.futures.Executor] = None,
+    ):
+        """Reading the listed branches for the range, concurrently with executor"""
+        names = [n for n in names if n in self and n not in self._columns]
+        if executor is None or len(names) < 2:
+            for name in names:
+                self[name]
+            return
+        for name, array in zip(names, executor.map(self._read, names)):
+            self._columns[name] = array
+
+    def _read(self, name: str) -> awkward.Array:
+        loaded = self.parent.loaded(name)
+        if loaded is not None:
+            return loaded[self.start : self.stop]
+        with span("read", branch=name, start=self.start, stop=self.stop) as record:
+            array = self.parent.branch(name).array(
+                entry_start=self.start, entry_stop=self.stop
+            )
+            record.add_bytes(array.nbytes)
+        return array
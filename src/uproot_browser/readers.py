@@ -0,0 +1,453 @@
+import abc
+import concurrent.futures
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .arrow_ipc import read_layout
+from .file_scan import BranchInfo, TreeInfo, rntuple_sizes, scan_file
+from .summary_cache import file_key
+
+if TYPE_CHECKING:
+    import awkward
+    import pyarrow
+
+# Path of the single table held by the columnar formats
+TABLE_PATH = "table"
+
+
+def is_url(file_path: str) -> bool:
+    return "://" in file_path
+
+
+def _stat_key(kind: str, file_path: str) -> str:
+    stat = os.stat(file_path)
+    return f"{kind}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as err:
+        raise ImportError(
+            "pyarrow is required to read Parquet and Arrow files, "
+            "install uproot_browser[arrow]"
+        ) from err
+    return pyarrow
+
+
+def _without_missing(layout: "awkward.contents.Content"):
+    """
+    Dropping the option types that Arrow adds for nullable fields when no value
+    is actually missing, such that the content buffers are plain arrays. The
+    buffers themselves are not copied.
+    """
+    import awkward
+    import numpy
+
+    if isinstance(layout, awkward.contents.UnmaskedArray):
+        return _without_missing(layout.content)
+    if isinstance(
+        layout, (awkward.contents.BitMaskedArray, awkward.contents.ByteMaskedArray)
+    ):
+        if numpy.any(layout.mask_as_bool(valid_when=False)):
+            return layout
+        return _without_missing(layout.content[: layout.length])
+    if isinstance(
+        layout,
+        (
+            awkward.contents.ListOffsetArray,
+            awkward.contents.ListArray,
+            awkward.contents.RegularArray,
+        ),
+    ):
+        return layout.copy(content=_without_missing(layout.content))
+    if isinstance(layout, awkward.contents.RecordArray):
+        return layout.copy(contents=[_without_missing(c) for c in layout.contents])
+    return layout
+
+
+def _to_awkward(column: "pyarrow.ChunkedArray") -> "awkward.Array":
+    import awkward
+
+    array = awkward.from_arrow(column)
+    return awkward.Array(_without_missing(array.layout))
+
+
+class ArrowColumn:
+    """Single column of a columnar table, read by row group or record batch"""
+
+    def __init__(self, table: "ArrowTable", name: str):
+        self.table = table
+        self.name = name
+        self.count_branch = None
+
+    @property
+    def num_entries(self) -> int:
+        return self.table.num_entries
+
+    @property
+    def entry_offsets(self) -> List[int]:
+        return self.table.entry_offsets
+
+    @property
+    def typename(self) -> str:
+        return str(self.table.schema.field(self.name).type)
+
+    @property
+    def compressed_bytes(self) -> int:
+        return self.table.column_sizes()[self.name][0]
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return self.table.column_sizes()[self.name][1]
+
+    def array(
+        self, entry_start: Optional[int] = None, entry_stop: Optional[int] = None
+    ) -> "awkward.Array":
+        start = 0 if entry_start is None else max(entry_start, 0)
+        stop = self.num_entries if entry_stop is None else entry_stop
+        stop = min(max(stop, start), self.num_entries)
+        return _to_awkward(self.table.read(self.name, start, stop))
+
+
+class ArrowTable(abc.ABC):
+    """
+    Tree-like access to a columnar table. Columns are only read on request,
+    for the row groups (or record batches) overlapping the requested range.
+    """
+
+    kind = "Arrow"
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.schema: Optional["pyarrow.Schema"] = None
+        self.entry_offsets: List[int] = [0]
+
+    @property
+    def num_entries(self) -> int:
+        return self.entry_offsets[-1]
+
+    def keys(self) -> List[str]:
+        return list(self.schema.names)
+
+    def __getitem__(self, name: str) -> ArrowColumn:
+        if name not in self.schema.names:
+            raise KeyError(name)
+        return ArrowColumn(self, name)
+
+    def _groups(self, start: int, stop: int) -> List[int]:
+        offsets = self.entry_offsets
+        return [
+            i
+            for i in range(len(offsets) - 1)
+            if offsets[i] < stop and offsets[i + 1] > start
+        ]
+
+    @abc.abstractmethod
+    def column_sizes(self) -> Dict[str, Tuple[int, int]]:
+        """Compressed and uncompressed bytes of each column"""
+
+    @abc.abstractmethod
+    def read(self, name: str, start: int, stop: int) -> "pyarrow.ChunkedArray":
+        """Column values of the entries from start to stop"""
+
+
+class ParquetTable(ArrowTable):
+    """
+    Parquet file, memory mapped. The metadata is parsed once and shared by the
+    readers of the individual row groups.
+    """
+
+    kind = "Parquet"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        pyarrow = _import_pyarrow()
+        handle = pyarrow.parquet.ParquetFile(file_path, memory_map=True)
+        self.metadata = handle.metadata
+        self.schema = handle.schema_arrow
+        for i in range(self.metadata.num_row_groups):
+            rows = self.metadata.row_group(i).num_rows
+            self.entry_offsets.append(self.entry_offsets[-1] + rows)
+        self._sizes: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def column_sizes(self) -> Dict[str, Tuple[int, int]]:
+        if self._sizes is None:
+            sizes = {name: [0, 0] for name in self.schema.names}
+            for i in range(self.metadata.num_row_groups):
+                group = self.metadata.row_group(i)
+                for j in range(group.num_columns):
+                    chunk = group.column(j)
+                    # Nested fields are stored as separate leaf columns
+                    name = chunk.path_in_schema.split(".")[0]
+                    if name in sizes:
+                        sizes[name][0] += chunk.total_compressed_size
+                        sizes[name][1] += chunk.total_uncompressed_size
+            self._sizes = {name: tuple(size) for name, size in sizes.items()}
+        return self._sizes
+
+    def read(self, name: str, start: int, stop: int) -> "pyarrow.ChunkedArray":
+        pyarrow = _import_pyarrow()
+        groups = self._groups(start, stop)
+        if not groups:
+            return pyarrow.chunked_array([], type=self.schema.field(name).type)
+        # A handle per read, as concurrent reads on a single handle are not safe
+        handle = pyarrow.parquet.ParquetFile(
+            self.file_path, memory_map=True, metadata=self.metadata
+        )
+        table = handle.read_row_groups(groups, columns=[name])
+        first = self.entry_offsets[groups[0]]
+        return table.column(name).slice(start - first, stop - start)
+
+
+class IPCTable(ArrowTable):
+    """
+    Arrow IPC (Feather v2) file, memory mapped. Only the footer and the
+    metadata of the record batches are parsed when the file is opened, giving
+    the batch lengths and column sizes. Columns are read by record batch on
+    request: uncompressed columns without any copy, compressed ones
+    decompressing only the requested column.
+    """
+
+    kind = "Arrow"
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        pyarrow = _import_pyarrow()
+        source = pyarrow.memory_map(file_path)
+        self.schema = pyarrow.ipc.open_file(source).schema
+        self._sizes = {name: (0, 0) for name in self.schema.names}
+        for rows, sizes in read_layout(source, self.schema):
+            self.entry_offsets.append(self.entry_offsets[-1] + rows)
+            for name, (stored, unpacked) in sizes.items():
+                total = self._sizes[name]
+                self._sizes[name] = (total[0] + stored, total[1] + unpacked)
+
+    def _reader(self, fields: List[int]) -> "pyarrow.ipc.RecordBatchFileReader":
+        # A reader per read, as concurrent reads on a single reader are not safe
+        pyarrow = _import_pyarrow()
+        options = pyarrow.ipc.IpcReadOptions(included_fields=fields)
+        return pyarrow.ipc.open_file(
+            pyarrow.memory_map(self.file_path), options=options
+        )
+
+    def _batches(self, name: str, groups: List[int]) -> List["pyarrow.Array"]:
+        reader = self._reader([self.schema.get_field_index(name)])
+        return [reader.get_batch(i).column(0) for i in groups]
+
+    def column_sizes(self) -> Dict[str, Tuple[int, int]]:
+        return self._sizes
+
+    def read(self, name: str, start: int, stop: int) -> "pyarrow.ChunkedArray":
+        pyarrow = _import_pyarrow()
+        groups = self._groups(start, stop)
+        column = pyarrow.chunked_array(
+            self._batches(name, groups), type=self.schema.field(name).type
+        )
+        if not groups:
+            return column
+        first = self.entry_offsets[groups[0]]
+        return column.slice(start - first, stop - start)
+
+
+class RNTupleField:
+    """Top-level field of an RNTuple, its pages are read by entry range"""
+
+    def __init__(self, rntuple: "RNTupleTree", name: str):
+        self.rntuple = rntuple
+        self.name = name
+        self.field = rntuple.rntuple[name]
+        self.count_branch = None
+
+    @property
+    def num_entries(self) -> int:
+        return self.rntuple.num_entries
+
+    @property
+    def entry_offsets(self) -> List[int]:
+        return self.rntuple.entry_offsets
+
+    @property
+    def typename(self) -> str:
+        return self.field.typename
+
+    @property
+    def compressed_bytes(self) -> int:
+        return self.rntuple.sizes().get(self.name, (0, 0))[0]
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        return self.rntuple.sizes().get(self.name, (0, 0))[1]
+
+    def array(
+        self, entry_start: Optional[int] = None, entry_stop: Optional[int] = None
+    ) -> "awkward.Array":
+        return self.field.array(
+            entry_start=entry_start,
+            entry_stop=entry_stop,
+            decompression_executor=self.rntuple.executor,
+        )
+
+
+class RNTupleTree:
+    """
+    Tree-like access to the top-level fields of an RNTuple. The fields are
+    listed from the header and footer, and the pages of a field are only read
+    and decompressed when the field is requested. The clusters take the role
+    of the TTree baskets for the partial reads.
+    """
+
+    def __init__(self, rntuple, executor: Optional[concurrent.futures.Executor] = None):
+        self.rntuple = rntuple
+        self.executor = executor
+        self.entry_offsets = [0] + [
+            c.num_first_entry + c.num_entries for c in rntuple.cluster_summaries
+        ]
+        self._sizes: Optional[Dict[str, Tuple[int, int]]] = None
+
+    @property
+    def num_entries(self) -> int:
+        return self.rntuple.num_entries
+
+    def keys(self) -> List[str]:
+        return list(self.rntuple.keys())
+
+    def __getitem__(self, name: str) -> RNTupleField:
+        return RNTupleField(self, name)
+
+    def sizes(self) -> Dict[str, Tuple[int, int]]:
+        if self._sizes is None:
+            self._sizes = rntuple_sizes(self.rntuple)
+        return self._sizes
+
+
+class FileReader(abc.ABC):
+    """
+    Opened file of a given format. The reader lists the tree-like objects of
+    the file from its metadata, and hands out trees exposing the subset of the
+    uproot TTree interface used by the lazy columns: keys, item access,
+    num_entries, and per-branch array reads of entry ranges.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def close(self):
+        """Releasing the file handles, the trees can no longer be read"""
+
+    @property
+    @abc.abstractmethod
+    def file_id(self) -> str:
+        """Identifier of the file contents, used as key of the summary cache"""
+
+    @abc.abstractmethod
+    def scan(self) -> List[TreeInfo]:
+        """Tree-like objects of the file, listed from its metadata"""
+
+    @abc.abstractmethod
+    def tree(self, path: str):
+        """Tree-like object at the path"""
+
+
+class ROOTReader(FileReader):
+    def __init__(
+        self,
+        file_path: str,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ):
+        import uproot
+
+        super().__init__(file_path)
+        self.executor = executor
+        opener = uproot.open
+        if is_url(file_path):
+            from .remote import open_url as opener
+        self.uproot_file = opener(
+            file_path,
+            array_cache=None,  # Columns are cached by the browser
+            decompression_executor=executor,
+            interpretation_executor=executor,
+        )
+
+    def close(self):
+        self.uproot_file.close()
+
+    @property
+    def file_id(self) -> str:
+        return file_key(self.file_path, self.uproot_file)
+
+    def scan(self) -> List[TreeInfo]:
+        return scan_file(self.uproot_file)
+
+    def tree(self, path: str):
+        import uproot
+
+        tree = self.uproot_file[path]
+        if isinstance(tree, uproot.behaviors.RNTuple.RNTuple):
+            return RNTupleTree(tree, self.executor)
+        if not isinstance(tree, uproot.behaviors.TTree.TTree):
+            raise TypeError(f"Got type {type(tree)} for a tree")
+        return tree
+
+
+class ArrowReader(FileReader):
+    """Parquet and Arrow IPC files, holding a single table"""
+
+    def __init__(self, file_path: str, table_type: type):
+        super().__init__(file_path)
+        self.table: ArrowTable = table_type(file_path)
+
+    @property
+    def file_id(self) -> str:
+        return _stat_key(self.table.kind, self.file_path)
+
+    def scan(self) -> List[TreeInfo]:
+        table = self.table
+        info = TreeInfo(TABLE_PATH, table.kind, table.num_entries)
+        for name in table.keys():
+            column = table[name]
+            info.branches[name] = BranchInfo(
+                name,
+                name,
+                table.num_entries,
+                column.typename,
+                column.typename,
+                compressed_bytes=column.compressed_bytes,
+                uncompressed_bytes=column.uncompressed_bytes,
+            )
+        return [info]
+
+    def tree(self, path: str) -> ArrowTable:
+        if path.strip("/") != TABLE_PATH:
+            raise KeyError(path)
+        return self.table
+
+
+# Columnar formats by file extension, any other file is opened as ROOT
+ARROW_TABLES = {
+    ".parquet": ParquetTable,
+    ".pq": ParquetTable,
+    ".arrow": IPCTable,
+    ".feather": IPCTable,
+    ".ipc": IPCTable,
+}
+
+
+def open_reader(
+    file_path: str, executor: Optional[concurrent.futures.Executor] = None
+) -> FileReader:
+    """Opening the file with the backend matching its extension"""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in ARROW_TABLES and is_url(file_path):
+        raise ValueError("Parquet and Arrow files can only be opened locally")
+    if extension in ARROW_TABLES:
+        return ArrowReader(file_path, ARROW_TABLES[extension])
+    return ROOTReader(file_path, executor)
@@ -0,0 +1,325 @@
+import collections
+import concurrent.futures
+import http.client
+import queue
+import threading
+import urllib.parse
+from typing import Dict, List, Optional, Tuple
+
+import uproot
+import uproot.source.chunk
+
+# Schemes read with the block cached source, others are left to uproot
+HTTP_SCHEMES = {"http", "https"}
+
+
+class BlockCache:
+    """
+    Fixed size blocks of a remote file, evicted in order of last use once the
+    total exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._blocks: collections.OrderedDict[int, bytes] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._blocks
+
+    def get(self, index: int) -> Optional[bytes]:
+        with self._lock:
+            block = self._blocks.get(index)
+            if block is None:
+                self.misses += 1
+                return None
+            self._blocks.move_to_end(index)
+            self.hits += 1
+            return block
+
+    def put(self, index: int, block: bytes):
+        with self._lock:
+            if index in self._blocks:
+                return
+            self._blocks[index] = block
+            self.size += len(block)
+            while self.size > self.max_bytes and len(self._blocks) > 1:
+                _, evicted = self._blocks.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class ConnectionPool:
+    """
+    At most max_connections keep-alive connections to the host of the URL.
+    Callers block until a connection is free.
+    """
+
+    def __init__(self, url: str, max_connections: int, timeout: Optional[float]):
+        parsed = urllib.parse.urlparse(url)
+        self.host = parsed.netloc
+        self.path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        self.timeout = timeout
+        self._connection_type = (
+            http.client.HTTPSConnection
+            if parsed.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def request(self, method: str, headers: Dict[str, str]) -> Tuple[int, dict, bytes]:
+        """Status, headers, and body of a request, retried once on a stale link"""
+        self._slots.acquire()
+        try:
+            for attempt in range(2):
+                try:
+                    connection = self._idle.get_nowait()
+                except queue.Empty:
+                    connection = self._connection_type(self.host, timeout=self.timeout)
+                try:
+                    connection.request(method, self.path, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    if attempt:
+                        raise
+                    continue
+                self._idle.put(connection)
+                return response.status, dict(response.getheaders()), body
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+class CachedHTTPSource(uproot.source.chunk.Source):
+    """
+    HTTP(S) source that reads the file in fixed size blocks. Blocks are kept
+    in a local cache, and the byte ranges requested together (the baskets of a
+    branch) are coalesced into runs of blocks, each fetched with a single range
+    request. A miss of such a group also reads ahead the following blocks, as
+    the baskets of a branch are mostly stored next to each other. Single reads
+    (the file and tree metadata) are not read ahead.
+
+    The behavior is set with the uproot.open options http_block_size,
+    http_read_ahead (blocks), http_max_gap (blocks of unrequested data that
+    are fetched to merge two runs), http_cache_bytes, and http_max_connections.
+    """
+
+    def __init__(self, file_path: str, **options):
+        super().__init__()
+        self._file_path = file_path
+        self.block_size = int(options.get("http_block_size", 256 * 1024))
+        self.read_ahead = int(options.get("http_read_ahead", 4))
+        self.max_gap = int(options.get("http_max_gap", 1))
+        self.cache = BlockCache(int(options.get("http_cache_bytes", 256 * 10**6)))
+        max_connections = int(options.get("http_max_connections", 4))
+        self._pool = ConnectionPool(file_path, max_connections, options.get("timeout"))
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+        self._closed = False
+        # Blocks being fetched, to not request the same block twice
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._num_bytes = self._fetch_num_bytes()
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self._file_path!r}>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pool.close()
+        self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _fetch_num_bytes(self) -> int:
+        status, headers, _ = self._pool.request("GET", {"Range": "bytes=0-0"})
+        self._num_requests += 1
+        if status != 206:
+            raise OSError(
+                f"server responded with status {status} rather than 206 (range "
+                f"requests) for {self._file_path}"
+            )
+        # Content-Range: bytes 0-0/total
+        return int(headers["Content-Range"].rsplit("/", 1)[1])
+
+    def _fetch_run(self, first: int, last: int) -> Dict[int, bytes]:
+        start = first * self.block_size
+        stop = min((last + 1) * self.block_size, self._num_bytes)
+        headers = {"Range": f"bytes={start}-{stop - 1}"}
+        status, _, body = self._pool.request("GET", headers)
+        if status != 206 or len(body) != stop - start:
+            raise OSError(
+                f"expected {stop - start} bytes with status 206, got {len(body)} "
+                f"bytes with status {status} for {self._file_path}"
+            )
+        with self._lock:
+            self._num_requests += 1
+            self._num_requested_bytes += len(body)
+        blocks = {}
+        for index in range(first, last + 1):
+            offset = (index - first) * self.block_size
+            blocks[index] = body[offset : offset + self.block_size]
+            self.cache.put(index, blocks[index])
+        return blocks
+
+    def _runs(self, missing: List[int], read_ahead: int) -> List[Tuple[int, int]]:
+        """
+        Merging missing blocks into runs fetched with one request each. Blocks
+        that would be read ahead anyway, or that are at most max_gap blocks
+        apart, are merged into the same run, unless a block in between is
+        already available and would be fetched twice.
+        """
+        merge_distance = max(self.max_gap, read_ahead) + 1
+        runs: List[Tuple[int, int]] = []
+        for index in missing:
+            if (
+                runs
+                and index - runs[-1][1] <= merge_distance
+                and not any(self._available(i) for i in range(runs[-1][1] + 1, index))
+            ):
+                runs[-1] = (runs[-1][0], index)
+            else:
+                runs.append((index, index))
+        # Reading ahead up to the first block that is already available
+        n_blocks = (self._num_bytes + self.block_size - 1) // self.block_size
+        extended = []
+        for first, last in runs:
+            stop = min(last + read_ahead, n_blocks - 1)
+            while last < stop and not self._available(last + 1):
+                last += 1
+            extended.append((first, last))
+        return extended
+
+    def _available(self, index: int) -> bool:
+        return index in self.cache or index in self._pending
+
+    def _plan(
+        self, ranges: List[Tuple[int, int]], read_ahead: int
+    ) -> Tuple[Dict[int, bytes], Dict[int, concurrent.futures.Future]]:
+        """
+        Blocks covering the ranges that are already cached, and the fetches
+        of the blocks that are not. New fetches are submitted to the executor.
+        """
+        needed = sorted(
+            {
+                index
+                for start, stop in ranges
+                for index in range(
+                    start // self.block_size, (stop - 1) // self.block_size + 1
+                )
+            }
+        )
+        cached, fetches = {}, {}
+        with self._lock:
+            missing = []
+            for index in needed:
+                block = self.cache.get(index)
+                if block is not None:
+                    cached[index] = block
+                elif index in self._pending:
+                    fetches[index] = self._pending[index]
+                else:
+                    missing.append(index)
+            for first, last in self._runs(missing, read_ahead):
+                future = self._executor.submit(self._fetch_run, first, last)
+                future.add_done_callback(self._release(first, last))
+                for index in range(first, last + 1):
+                    self._pending.setdefault(index, future)
+                    if index in missing:
+                        fetches[index] = future
+        return cached, fetches
+
+    def _release(self, first: int, last: int):
+        def release(future: concurrent.futures.Future):
+            with self._lock:
+                for index in range(first, last + 1):
+                    if self._pending.get(index) is future:
+                        del self._pending[index]
+
+        return release
+
+    def _assemble(self, start: int, stop: int, blocks: Dict[int, bytes]) -> bytes:
+        first = start // self.block_size
+        last = (stop - 1) // self.block_size
+        data = b"".join(blocks[i] for i in range(first, last + 1))
+        offset = start - first * self.block_size
+        return data[offset : offset + stop - start]
+
+    def _fill(
+        self,
+        start: int,
+        stop: int,
+        cached: Dict[int, bytes],
+        fetches: Dict[int, concurrent.futures.Future],
+    ) -> concurrent.futures.Future:
+        # Future of the range, completed once the runs it depends on are fetched
+        result: concurrent.futures.Future = concurrent.futures.Future()
+        indices = range(start // self.block_size, (stop - 1) // self.block_size + 1)
+        depends = {id(fetches[i]): fetches[i] for i in indices if i in fetches}
+        remaining = len(depends)
+        lock = threading.Lock()
+
+        def finish():
+            try:
+                blocks = dict(cached)
+                for future in depends.values():
+                    blocks.update(future.result())
+                result.set_result(self._assemble(start, stop, blocks))
+            except Exception as err:  # Reported when the chunk is read
+                result.set_exception(err)
+
+        def done(_):
+            nonlocal remaining
+            with lock:
+                remaining -= 1
+                if remaining > 0:
+                    return
+            finish()
+
+        if not depends:
+            finish()
+        for future in depends.values():
+            future.add_done_callback(done)
+        return result
+
+    def chunk(self, start: int, stop: int) -> uproot.source.chunk.Chunk:
+        self._num_requested_chunks += 1
+        cached, fetches = self._plan([(start, stop)], 0)
+        data = self._fill(start, stop, cached, fetches).result()
+        return uproot.source.chunk.Chunk.wrap(self, data, start)
+
+    def chunks(
+        self, ranges: List[Tuple[int, int]], notifications: queue.Queue
+    ) -> List[uproot.source.chunk.Chunk]:
+        self._num_requested_chunks += len(ranges)
+        cached, fetches = self._plan(ranges, self.read_ahead)
+        chunks = []
+        for start, stop in ranges:
+            future = self._fill(start, stop, cached, fetches)
+            chunk = uproot.source.chunk.Chunk(self, start, stop, future)
+            future.add_done_callback(uproot.source.chunk.notifier(chunk, notifications))
+            chunks.append(chunk)
+        return chunks
+
+
+def open_url(file_path: str, **options) -> "uproot.ReadOnlyDirectory":
+    """
+    Opening a remote ROOT file. HTTP(S) URLs are read through the block cached
+    source, other schemes (root://, s3://, ...) through the uproot defaults.
+    """
+    scheme = urllib.parse.urlparse(file_path).scheme
+    if scheme in HTTP_SCHEMES:
+        options.setdefault("handler", CachedHTTPSource)
+    return uproot.open(file_path, **options)
@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import textual.timer
+
+if TYPE_CHECKING:
+    import textual.app
+
+    from .app import OpenedTree
+    from .lazy_array import LazyColumns
+
+
+class JobCancelled(Exception):
+    """Raised within a plot job once a newer request has been submitted"""
+
+
+class PlotJob:
+    """
+    A single plot request on the file and tree it was submitted for. The job
+    is current as long as no newer request has been submitted, stale jobs stop
+    at their next check and their results are never displayed.
+    """
+
+    def __init__(
+        self,
+        scheduler: "PlotScheduler",
+        generation: int,
+        expression: str,
+        opened: "OpenedTree",
+    ):
+        self.scheduler = scheduler
+        self.generation = generation
+        self.expression = expression
+        self.opened = opened
+
+    @property
+    def columns(self) -> "LazyColumns":
+        return self.opened.columns
+
+    @property
+    def is_current(self) -> bool:
+        return self.generation == self.scheduler.generation
+
+    def check(self):
+        """Cancellation point, called between chunks and basket reads"""
+        if not self.is_current:
+            raise JobCancelled()
+
+    def call(self, callback: Callable, *args: Any):
+        """
+        Running the callback on the main thread from the job thread. The call is
+        dropped if the job is superseded in the meantime, such that a stale
+        result can never overwrite the display of a newer one.
+        """
+        self.check()
+        self.scheduler.app.call_from_thread(self._deliver, callback, *args)
+
+    def _deliver(self, callback: Callable, *args: Any):
+        if self.is_current:
+            callback(*args)
+
+
+class PlotScheduler:
+    """
+    Ordering of the plot requests. Each submission gets a new generation, which
+    marks all earlier jobs as stale. Jobs are started after a short delay, and
+    requests arriving within the delay collapse into the latest one. Only the
+    main thread submits requests.
+    """
+
+    def __init__(
+        self,
+        app: "textual.app.App",
+        start: Callable[[PlotJob], None],
+        delay: float = 0.05,
+    ):
+        self.app = app
+        self.delay = delay
+        self.generation = 0
+        self._start = start
+        self._pending: Optional[PlotJob] = None
+        self._timer: Optional[textual.timer.Timer] = None
+        # Number of requests that were dropped before starting
+        self.coalesced = 0
+
+    def submit(self, expression: str, opened: "OpenedTree") -> PlotJob:
+        self.generation += 1
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = PlotJob(self, self.generation, expression, opened)
+        if self._timer is None:
+            self._timer = self.app.set_timer(self.delay, self._flush)
+        return self._pending
+
+    def cancel(self):
+        """Marking all submitted jobs as stale, including the pending one"""
+        self.generation += 1
+        self._pending = None
+
+    def _flush(self):
+        self._timer = None
+        job, self._pending = self._pending, None
+        if job is not None and job.is_current:
+            self._start(job)
@@ -0,0 +1,114 @@
+import concurrent.futures
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+import awkward
+import numpy
+
+from .array_stats import StatsAccumulator, flatten_content
+from .expression import evaluate, parse
+from .lazy_array import LazyColumns
+
+# Called after each chunk: (entries processed, total entries, chunk array, stats)
+ChunkCallback = Callable[[int, int, awkward.Array, StatsAccumulator], None]
+
+
+def _accumulate_flat(flat: numpy.ndarray) -> StatsAccumulator:
+    accumulator = StatsAccumulator()
+    accumulator.update_flat(flat)
+    return accumulator
+
+
+def accumulate_parallel(
+    array: awkward.Array,
+    executor: Optional[concurrent.futures.Executor] = None,
+    n_parts: int = 1,
+) -> StatsAccumulator:
+    """
+    Accumulating the statistics of an in-memory array. With an executor, the
+    flattened buffer is split into n_parts views that are filled in parallel
+    and merged afterwards.
+    """
+    flat = flatten_content(array)
+    if executor is None or n_parts <= 1:
+        accumulator = _accumulate_flat(flat)
+    else:
+        accumulator = StatsAccumulator()
+        parts = numpy.array_split(flat, n_parts)
+        for partial in executor.map(_accumulate_flat, parts):
+            accumulator.merge(partial)
+    accumulator.update_multiplicity(array)
+    accumulator.values = flat
+    return accumulator
+
+
+def _accumulate_range(
+    expression: str, columns: LazyColumns, start: int, stop: int
+) -> tuple:
+    view = columns.range_view(start, stop)
+    # Only the branches used by the expression are read for the range
+    view.preload(parse(expression).branches)
+    array = evaluate(expression, view)
+    accumulator = StatsAccumulator()
+    accumulator.update(array)
+    return array, accumulator
+
+
+def sample_stats(
+    expression: str, columns: LazyColumns, ranges: List[Tuple[int, int]]
+) -> Tuple[Optional[awkward.Array], StatsAccumulator]:
+    """
+    Statistics of the plot definition evaluated on the given entry ranges only,
+    returning the array of the first range alongside the merged statistics.
+    """
+    first, accumulator = None, StatsAccumulator()
+    for start, stop in ranges:
+        array, partial = _accumulate_range(expression, columns, start, stop)
+        first = array if first is None else first
+        accumulator.merge(partial)
+    return first, accumulator
+
+
+def stream_stats(
+    expression: str,
+    columns: LazyColumns,
+    chunk_size: int,
+    on_chunk: Optional[ChunkCallback] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+    n_parallel: int = 1,
+) -> StatsAccumulator:
+    """
+    Evaluating the plot definition on fixed size entry ranges of the tree, and
+    accumulating the statistics chunk by chunk. Only the branches of a single
+    chunk are held in memory at a time. The expression must be element-wise
+    for the results to match the full-array evaluation.
+
+    With an executor, up to n_parallel chunks are read and filled concurrently,
+    and their partial statistics are merged in entry order.
+    """
+    accumulator = StatsAccumulator()
+    total = columns.num_entries
+    ranges = deque(columns.entry_ranges(chunk_size))
+    pending = deque()
+    try:
+        while ranges or pending:
+            while executor is not None and ranges and len(pending) < n_parallel:
+                start, stop = ranges.popleft()
+                job = executor.submit(
+                    _accumulate_range, expression, columns, start, stop
+                )
+                pending.append((stop, job))
+            if pending:
+                stop, job = pending.popleft()
+                array, partial = job.result()
+            else:
+                start, stop = ranges.popleft()
+                array, partial = _accumulate_range(expression, columns, start, stop)
+            accumulator.merge(partial)
+            if on_chunk is not None:
+                on_chunk(stop, total, array, accumulator)
+    finally:
+        # Chunks that have not started are dropped if the stream is aborted
+        for _, job in pending:
+            job.cancel()
+    return accumulator
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import uproot
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, "uproot_browser")
+
+
+def file_key(file_path: str, uproot_file: "uproot.ReadOnlyDirectory") -> str:
+    """Identifier of the file contents: the ROOT UUID, file size and mtime"""
+    if "://" in file_path:  # Remote files only have the size at hand
+        return f"{uproot_file.file.uuid}:{uproot_file.file.source.num_bytes}"
+    stat = os.stat(file_path)
+    return f"{uproot_file.file.uuid}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class SummaryCache:
+    """
+    On-disk store of the per-branch summaries, with one JSON record per file,
+    tree, and normalized plot definition. Records are evicted in order of last
+    use once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 256 * 10**6):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, file_id: str, tree_path: str, expression_key: str) -> str:
+        digest = hashlib.sha256()
+        for part in (file_id, tree_path, expression_key):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def load(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+            os.utime(path)  # Marking the record as recently used
+            return record
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, record: dict):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._path(key) + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+        except OSError:
+            pass  # The cache is an optimization only, failures are not fatal
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
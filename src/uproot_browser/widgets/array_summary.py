@@ -1,19 +1,145 @@
-import awkward
+from typing import TYPE_CHECKING, Any, List, Optional
+
 import textual
 import textual.widgets
 
+if TYPE_CHECKING:
+    import awkward
+
+
+def _format_items(values: Any, budget: int) -> str:
+    # Comma separated items of a list or record, stopping at the budget
+    is_record = isinstance(values, dict)
+    parts: List[str] = []
+    used = 0
+    for key, item in values.items() if is_record else enumerate(values):
+        part = _format_value(item, max(budget - used - 5, 3))
+        part = f"{key}: {part}" if is_record else part
+        # Only the first item is cut, later items that do not fit are elided,
+        # keeping room for the ", ..."
+        if parts and used + len(part) + 5 > budget:
+            parts.append("...")
+            break
+        parts.append(part)
+        used += len(part) + 2
+    return ", ".join(parts)
+
+
+def _format_value(value: Any, budget: int) -> str:
+    """Text of a single entry, nested lists and records cut at the budget"""
+    if isinstance(value, float):
+        text = f"{value:.3g}"
+    elif isinstance(value, dict):
+        text = f"{{{_format_items(value, budget - 2)}}}"
+    elif isinstance(value, (list, tuple)):
+        text = f"[{_format_items(value, budget - 2)}]"
+    else:
+        text = str(value)
+    return text if len(text) <= budget else text[: max(budget - 3, 0)] + "..."
+
+
+def _edge_entries(array: "awkward.Array", start: int, stop: int, width: int) -> list:
+    # Entries of the range as python objects, with the inner lists cut to width
+    # elements before the conversion
+    part = array[start:stop]
+    if array.ndim > 1:
+        try:
+            part = part[(slice(None),) + (slice(0, width),) * (array.ndim - 1)]
+        except Exception:  # Layouts that cannot be sliced along the inner dims
+            pass
+    return part.to_list()
+
+
+def format_preview(array: "awkward.Array", budget: int = 240, n_edge: int = 3) -> str:
+    """
+    Bounded text of the array from its first and last n_edge entries only, in
+    at most `budget` characters. Only the entries displayed are converted,
+    whatever the size and depth of the array.
+    """
+    length = len(array)
+    width = max(budget // 8, 4)
+    if length <= 2 * n_edge:
+        entries = _edge_entries(array, 0, length, width)
+        return _format_value(entries, budget)
+    head = _edge_entries(array, 0, n_edge, width)
+    tail = _edge_entries(array, length - n_edge, length, width)
+    half = (budget - 9) // 2
+    return f"[{_format_items(head, half)}, ..., {_format_items(tail, half)}]"
 
-class ArraySummary(textual.widgets.TextArea):
-    """Simple output description"""
+
+class ArraySummary(textual.widgets.Static):
+    """
+    Type, dimensions, and a bounded preview of the displayed array. Clicking
+    (or Ctrl+Y) expands the panel to list the first and last entries one per
+    line, formatted only when expanded.
+    """
+
+    # Entries listed at each end of the array when expanded
+    expanded_entries = 50
 
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        super().__init__(*args, markup=False, **kwargs)
         self.can_focus = False
         self.border_title = "Array summary"
         self.styles.border = ("solid", "gray")
+        self.styles.overflow_y = "auto"
+        self.expanded = False
+        self._array: Optional["awkward.Array"] = None
+        self._header = ""
+        self._values = ""
+        self._collapsed_height = None
+
+    def clear(self):
+        self._array = None
+        self._header = ""
+        self._values = ""
+        self.update("")
+
+    def update_content(self, array: "awkward.Array"):
+        # The type and preview are only formatted once per displayed array
+        if array is self._array:
+            return
+        self._array = array
+        self._header = f"Type  : {array.type}\nDims  : {array.ndim}\n"
+        self._values = format_preview(array)
+        self._show()
+
+    def update_text(self, type_str: str, ndim: int, values: str):
+        # Summaries restored from the cache have no array to expand
+        self._array = None
+        self._header = f"Type  : {type_str}\nDims  : {ndim}\n"
+        self._values = values
+        self._show()
+
+    def toggle_expanded(self):
+        self.expanded = not self.expanded
+        if self.expanded:
+            self._collapsed_height = self.styles.max_height
+            self.styles.max_height = "60vh"
+        else:
+            self.styles.max_height = self._collapsed_height
+        self._show()
+
+    def on_click(self):
+        self.app.action_toggle_array_summary()
+
+    def _show(self):
+        if self.expanded and self._array is not None:
+            self.update(self._header + self._expanded_values())
+        else:
+            self.update(self._header + f"values: {self._values}")
 
-    def update_content(self, array: awkward.Array):
-        self.clear()
-        self.insert(f"Type  : {awkward.type(array)}\n")
-        self.insert(f"Dims  : {array.ndim}\n")
-        self.insert(f"values: {array}")
+    def _expanded_values(self) -> str:
+        array = self._array
+        length = len(array)
+        budget = max(self.size.width - 12, 40)
+        n = self.expanded_entries
+        ranges = [(0, length)] if length <= 2 * n else [(0, n), (length - n, length)]
+        lines = []
+        for start, stop in ranges:
+            if start > 0:
+                lines.append("...")
+            entries = _edge_entries(array, start, stop, budget // 4)
+            for index, entry in enumerate(entries, start):
+                lines.append(f"[{index}] {_format_value(entry, budget)}")
+        return "values:\n" + "\n".join(lines)
@@ -1,11 +1,21 @@
-import time
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import awkward
 import textual
+import textual.scroll_view
+import textual.timer
 import textual.widgets
-import uproot
-from fuzzyfinder import fuzzyfinder
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Region, Size
+from textual.strip import Strip
+
+from ..branch_groups import SCOPE_SEPARATOR, BranchGroup, group_branches
+from ..column_cache import format_size
+
+if TYPE_CHECKING:
+    import uproot
+
+    from ..fuzzy_index import FuzzyIndex
 
 
 class BranchSelectInput(textual.widgets.Input):
@@ -34,7 +44,7 @@ class BranchSelectInput(textual.widgets.Input):
         ),
     ]
 
-    def __init__(self, list_view: textual.widgets.ListView, *args, **kwargs):
+    def __init__(self, list_view: "BranchSelectList", *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.can_focus = True
         self.border_title = "Select branch"
@@ -51,64 +61,259 @@ class BranchSelectInput(textual.widgets.Input):
     def action_move_list_down(self):
         self.list_ref.action_cursor_down()
 
+    def action_cursor_right(self, select: bool = False):
+        # At the end of the input, the key expands the highlighted group
+        if not select and self.cursor_at_end and self.list_ref.expand_highlighted():
+            return
+        super().action_cursor_right(select)
+
+    def action_cursor_left(self, select: bool = False):
+        # At the start of the input, the key collapses the highlighted group
+        if not select and self.cursor_at_start and self.list_ref.collapse_highlighted():
+            return
+        super().action_cursor_left(select)
+
     def action_submit(self):
-        highlight = self.list_ref.highlighted_child
+        if self.list_ref.toggle_highlighted():
+            return
+        highlight = self.list_ref.highlighted_name
         if highlight is not None:
             self.clear()
-            self.value = str(highlight.name)
+            self.value = highlight
             self.action_end()
-            self.app.submit_branch_to_plot(highlight.name)
+            self.app.submit_branch_to_plot(highlight)
         else:
-            print("Nothing was selected")
-        textual.app.warnings.warn(str(self.list_ref.text_selection))
+            textual.app.warnings.warn("Nothing was selected")
 
 
-class BranchSelectList(textual.widgets.ListView):
+class BranchSelectList(textual.scroll_view.ScrollView):
     """
     List display of a the candidates of the fuzzy finder. Notice that we
     intentially make this unfocusable, as all interactions with this items
     should be handled by the main text input field.
+
+    Only the lines currently in view are rendered, so the cost of updating the
+    list does not depend on the number of matched branches. If known, the
+    number of bytes that need to be read for each branch is shown alongside.
+
+    Without a query, branches sharing a prefix (the Jet_* branches of a
+    collection) are shown as collapsed groups, expanded with the right key or
+    enter. Queries of the form "Jet:pt" are only matched against the branches
+    of the group.
     """
 
-    def __init__(self, ttree: uproot.TTree | None, *args, **kwargs):
-        self.original_fields = self.get_fields(ttree)
-        super().__init__(*self.make_listitems(self.original_fields), *args, **kwargs)
+    def __init__(self, ttree: "uproot.TTree | None", *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.can_focus = False
         self.border_title = "Matched branches"
         self.styles.border = ("solid", "gray")
-        self.last_update = time.time()
-
-    @classmethod
-    def get_fields(cls, ttree: uproot.TTree | None) -> List[str]:
-        if ttree is None:
-            return []
-        # Split is required for compound objects
-        return [f.split("/")[-1] for f in ttree.keys()]
-
-    @classmethod
-    def make_listitems(cls, fields: List[str]) -> List[textual.widgets.ListItem]:
-        return [
-            textual.widgets.ListItem(textual.widgets.Static(x), name=x) for x in fields
-        ]
+        self.styles.height = "auto"
+        self.styles.max_height = "80vh"
+        self._filter_timer: textual.timer.Timer | None = None
+        self.sizes: Dict[str, str] = {}
+        self._bytes: Dict[str, int] = {}
+        self._set_fields(ttree.keys() if ttree is not None else [])
 
-    def _update_with_array(self, array: awkward.Array):
-        self.original_fields = array.fields
-        self.clear()
-        self.extend(self.make_listitems(self.original_fields))
+    def _set_fields(self, keys: List[str]):
+        # Keys are the full paths of the branches, split is required for the
+        # names of compound objects
+        self.original_fields = [f.split("/")[-1] for f in keys]
+        self.groups = group_branches(keys)
+        self.index = None
+        # Fuzzy indices of the groups used in scoped queries
+        self._scope_indices: Dict[str, "FuzzyIndex"] = {}
+        if keys:
+            # Only imported once there is a tree, as it requires numpy
+            from ..fuzzy_index import FuzzyIndex
 
-    def fuzzy_filter(self, input_str: str):
-        if time.time() - self.last_update < 0.050:
-            return  # De-bouncing
-        self.clear()
-        new_list = (
-            self.original_fields
-            if input_str == ""
-            else fuzzyfinder(input_str, self.original_fields)
+            self.index = FuzzyIndex(self.original_fields)
+        self._set_rows(self.groups.rows())
+
+    def _set_matches(self, matches: List[str]):
+        self._set_rows([(0, name) for name in matches])
+
+    def _set_rows(
+        self,
+        rows: List[Tuple[int, Union[str, BranchGroup]]],
+        highlighted: int = 0,
+    ):
+        self.rows = rows
+        self.highlighted: int | None = highlighted if len(rows) else None
+        self._name_width = max(
+            (len(self._label(y)) for y in range(len(rows))), default=0
         )
-        self.extend(
-            [
-                textual.widgets.ListItem(textual.widgets.Static(f), name=f)
-                for f in new_list
+        size_width = max((len(x) for x in self.sizes.values()), default=0)
+        self._size_width = size_width + 1 if size_width else 0
+        self.virtual_size = Size(self._name_width + self._size_width, len(rows))
+        if self.is_mounted:
+            if highlighted:
+                self.scroll_to_region(Region(0, highlighted, 1, 1), animate=False)
+            else:
+                self.scroll_to(y=0, animate=False)
+        self.refresh()
+        self._notify_highlight()
+
+    def _label(self, idx: int) -> str:
+        depth, entry = self.rows[idx]
+        indent = "  " * depth
+        if isinstance(entry, BranchGroup):
+            marker = "▾" if entry.expanded else "▸"
+            return f"{indent}{marker} {entry.label} ({len(entry)})"
+        return indent + entry
+
+    def _entry_size(self, entry: Union[str, BranchGroup]) -> str:
+        if isinstance(entry, BranchGroup):
+            if not self._bytes:
+                return ""
+            return format_size(sum(self._bytes.get(n, 0) for n in entry.names))
+        return self.sizes.get(entry, "")
+
+    @property
+    def highlighted_name(self) -> str | None:
+        if self.highlighted is None:
+            return None
+        entry = self.rows[self.highlighted][1]
+        return None if isinstance(entry, BranchGroup) else entry
+
+    @property
+    def highlighted_group(self) -> Optional[BranchGroup]:
+        if self.highlighted is None:
+            return None
+        entry = self.rows[self.highlighted][1]
+        return entry if isinstance(entry, BranchGroup) else None
+
+    def _set_expanded(self, group: BranchGroup, expanded: bool):
+        # Only the tree display (no query) has groups. The group must be the
+        # highlighted row, which keeps its position as only the rows below it
+        # change
+        group.expanded = expanded
+        self._set_rows(self.groups.rows(), self.highlighted)
+
+    def expand_highlighted(self) -> bool:
+        group = self.highlighted_group
+        if group is None or group.expanded:
+            return False
+        self._set_expanded(group, True)
+        return True
+
+    def collapse_highlighted(self) -> bool:
+        """
+        Collapsing the highlighted group, or the group containing the
+        highlighted branch
+        """
+        if self.highlighted is None:
+            return False
+        group = self.highlighted_group
+        if group is None or not group.expanded:
+            # Looking up for the parent group
+            depth = self.rows[self.highlighted][0]
+            parents = [
+                entry
+                for d, entry in self.rows[: self.highlighted]
+                if d == depth - 1 and isinstance(entry, BranchGroup)
             ]
-        )
-        self.last_update = time.time()
+            if depth == 0 or not parents:
+                return False
+            group = parents[-1]
+            self.highlighted = self.rows.index((depth - 1, group))
+        self._set_expanded(group, False)
+        return True
+
+    def toggle_highlighted(self) -> bool:
+        group = self.highlighted_group
+        if group is None:
+            return False
+        self._set_expanded(group, not group.expanded)
+        return True
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        idx = scroll_y + y
+        width = self.scrollable_content_region.width
+        if idx >= len(self.rows):
+            return Strip.blank(width, self.rich_style)
+        style = self.rich_style
+        if idx == self.highlighted:
+            style += Style(reverse=True, bold=True)
+        entry = self.rows[idx][1]
+        if isinstance(entry, BranchGroup):
+            style += Style(bold=True)
+        # Sizes are aligned to the right edge, or after the longest name if the
+        # view is narrower than that
+        name_width = max(width - self._size_width, self._name_width)
+        size = self._entry_size(entry).rjust(self._size_width)
+        segments = [
+            Segment(self._label(idx).ljust(name_width), style),
+            Segment(size, style + Style(dim=True)),
+        ]
+        if name_width + self._size_width < scroll_x + width:
+            padding = scroll_x + width - name_width - self._size_width
+            segments.append(Segment(" " * padding, style))
+        return Strip(segments).crop(scroll_x, scroll_x + width)
+
+    def _move_highlight(self, step: int):
+        if self.highlighted is None:
+            return
+        self.highlighted = min(max(self.highlighted + step, 0), len(self.rows) - 1)
+        self.scroll_to_region(Region(0, self.highlighted, 1, 1), animate=False)
+        self.refresh()
+        self._notify_highlight()
+
+    def _notify_highlight(self):
+        # Letting the app prefetch the highlighted branch and its neighbors
+        if self.is_mounted and self.highlighted is not None:
+            idx = self.highlighted
+            nearby = [idx, idx + 1, idx - 1]
+            names = [
+                self.rows[i][1]
+                for i in nearby
+                if 0 <= i < len(self.rows) and isinstance(self.rows[i][1], str)
+            ]
+            self.app.schedule_prefetch(names)
+
+    def action_cursor_up(self):
+        self._move_highlight(-1)
+
+    def action_cursor_down(self):
+        self._move_highlight(1)
+
+    def _update_with_tree(
+        self,
+        ttree: "uproot.TTree | None",
+        sizes: Optional[Dict[str, Optional[int]]] = None,
+    ):
+        sizes = sizes or {}
+        self._bytes = {k: v for k, v in sizes.items() if v is not None}
+        self.sizes = {k: format_size(v) for k, v in self._bytes.items()}
+        self._set_fields(ttree.keys() if ttree is not None else [])
+
+    def fuzzy_filter(self, input_str: str):
+        # De-bouncing: only the last query is applied once typing pauses
+        if self._filter_timer is not None:
+            self._filter_timer.stop()
+        if self.index is None:
+            return
+        self._filter_timer = self.set_timer(0.050, lambda: self._apply_query(input_str))
+
+    def _apply_query(self, input_str: str):
+        if input_str == "":
+            self._set_rows(self.groups.rows())
+            return
+        scope, separator, query = input_str.rpartition(SCOPE_SEPARATOR)
+        if not separator:
+            self._set_matches(self.index.match(input_str))
+            return
+        # Indices of the scopes are only built once a scope is searched
+        scope = scope.lower()
+        index = self._scope_indices.get(scope)
+        if index is None:
+            from ..fuzzy_index import FuzzyIndex
+
+            group = self.groups.find(scope)
+            if group is not None:
+                names = group.names
+            else:
+                # Prefixes that are too small to be grouped
+                names = [n for n in self.original_fields if n.lower().startswith(scope)]
+            index = self._scope_indices[scope] = FuzzyIndex(names)
+        self._set_matches(index.match(query))
@@ -1,10 +1,13 @@
 from enum import Enum
+from typing import TYPE_CHECKING
 
-import awkward
-import numpy
 import textual_plotext
 
-from ..array_parse import ArraySummaryType, detect_summary_type
+from ..array_parse import ArraySummaryType
+from ..instrument import span
+
+if TYPE_CHECKING:
+    from ..array_stats import ArrayStats
 
 
 class _DisplayBackend(Enum):
@@ -18,12 +21,14 @@ class DistributionFigure(textual_plotext.PlotextPlot):
         self.border_title = "Distribution figure"
         self.styles.border = ("solid", "gray")
         self.backend = _DisplayBackend.text
+        # Whether the multiplicity of jagged arrays is drawn next to the content
+        self._split = False
 
-    def update_content(self, array: awkward.Array):
+    def update_content(self, stats: "ArrayStats"):
         self.plt.clear_data()
         self.plt.clear_figure()
 
-        def _fail(array):
+        def _fail(plt, stats):
             pass
 
         AType = ArraySummaryType
@@ -33,24 +38,46 @@ class DistributionFigure(textual_plotext.PlotextPlot):
             (AType.discrete, BEnd.text): self._discrete_figure_text,
             (AType.continuous, BEnd.text): self._continuous_figure_text,
         }
-        _map.get((detect_summary_type(array), self.backend), _fail)(array)
+        draw = _map.get((stats.summary_type, self.backend), _fail)
+        self._split = stats.multiplicity_counts is not None
+        if self._split:
+            self.plt.subplots(1, 2)
+            draw(self.plt.subplot(1, 1), stats)
+            self._multiplicity_figure_text(self.plt.subplot(1, 2), stats)
+        else:
+            draw(self.plt, stats)
         self.refresh()
 
-    def _boolean_figure_text(self, array: awkward.Array) -> str:
-        n_true = awkward.sum(array, axis=None)
-        n_false = awkward.count(array, axis=None) - n_true
-        self.plt.bar(["True", "False"], [n_true, n_false])
-
-    def _discrete_figure_text(self, array: awkward.Array):
-        if array.ndim != 1:
-            array = awkward.flatten(array, axis=None)
-        unique, counts = numpy.unique(array, return_counts=True)
-        counts = counts[numpy.argsort(unique)]
-        unique = unique[numpy.argsort(unique)]
-        self.plt.bar(unique, counts)
-
-    def _continuous_figure_text(self, array: awkward.Array) -> str:
-        if array.ndim != 1:
-            array = awkward.flatten(array, axis=None)
-        bins = 40
-        self.plt.hist(array, bins=bins)
+    def render(self):
+        with span("render"):
+            if self._split:
+                # The multiplicity only needs a third of the width
+                self.plt.subplot(1, 2).plotsize(max(self.size.width // 3, 16), None)
+            return super().render()
+
+    def set_status(self, status: str):
+        """Showing how the displayed distribution was obtained"""
+        self.border_subtitle = status
+
+    def _boolean_figure_text(self, plt, stats: "ArrayStats"):
+        plt.bar(["True", "False"], [stats.n_true, stats.count - stats.n_true])
+
+    def _discrete_figure_text(self, plt, stats: "ArrayStats"):
+        # Unique values are already sorted
+        plt.bar(stats.unique, stats.unique_counts)
+
+    def _continuous_figure_text(self, plt, stats: "ArrayStats"):
+        # Histogram is pre-binned, plotext only needs to draw the bars
+        plt.bar(stats.hist_centers, stats.hist_counts, reset_ticks=False)
+        title = []
+        if stats.underflow or stats.overflow:
+            title.append(f"Underflow {stats.underflow}, overflow {stats.overflow}")
+        if stats.hist_approximate:
+            title.append("approx. counts")
+        if title:
+            plt.title(", ".join(title))
+
+    def _multiplicity_figure_text(self, plt, stats: "ArrayStats"):
+        counts = stats.multiplicity_counts
+        plt.bar(list(range(len(counts))), counts)
+        plt.title(f"Multiplicity (mean {stats.mean_multiplicity or 0:.3g})")
@@ -1,11 +1,12 @@
-from enum import Enum
+from typing import TYPE_CHECKING
 
-import awkward
-import numpy
 import textual
 import textual.widgets
 
-from ..array_parse import ArraySummaryType, detect_summary_type
+from ..array_parse import ArraySummaryType
+
+if TYPE_CHECKING:
+    from ..array_stats import ArrayStats
 
 
 class DistributionSummary(textual.widgets.TextArea):
@@ -17,22 +18,22 @@ class DistributionSummary(textual.widgets.TextArea):
         self.border_title = "Distribution summary"
         self.styles.border = ("solid", "gray")
 
-    def update_content(self, array: awkward.Array):
+    def update_content(self, stats: "ArrayStats"):
         self.clear()
-        summary_type = detect_summary_type(array)
-        if summary_type is ArraySummaryType.boolean:
-            self.insert(self._boolean_summary(array))
-        elif summary_type is ArraySummaryType.discrete:
-            self.insert(self._discrete_summary(array))
+        if stats.summary_type is ArraySummaryType.boolean:
+            self.insert(self._boolean_summary(stats))
+        elif stats.summary_type is ArraySummaryType.discrete:
+            self.insert(self._discrete_summary(stats))
         else:
-            self.insert(self._default_summary(array))
+            self.insert(self._default_summary(stats))
 
     @classmethod
-    def _boolean_summary(cls, array: awkward.Array) -> str:
-        num = awkward.count(array, axis=None)
-        n_true = awkward.sum(array, axis=None)
+    def _boolean_summary(cls, stats: "ArrayStats") -> str:
+        num = stats.count
+        n_true = stats.n_true
         n_false = num - n_true
-        eff = n_true / num
+        # An empty selection has no ratio
+        eff = n_true / num if num else float("nan")
         return "\n".join(
             [
                 f"Entries    :  {num}",
@@ -42,33 +43,30 @@ class DistributionSummary(textual.widgets.TextArea):
         )
 
     @classmethod
-    def _discrete_summary(cls, array: awkward.Array) -> str:
-        num = awkward.count(array, axis=None)
-        if array.ndim != 1:
-            array = awkward.flatten(array, axis=None)
-        unique, counts = numpy.unique(array.to_numpy(), return_counts=True)
-        mode = None if len(unique) == 0 else unique[numpy.argmax(counts)]
+    def _discrete_summary(cls, stats: "ArrayStats") -> str:
         return "\n".join(
             [
-                f"Entries : {num}",
-                f"Distinct: {unique}",
-                f"mode: {mode}",
+                f"Entries : {stats.count}",
+                f"Distinct: {stats.unique}",
+                f"mode: {stats.mode}",
             ]
         )
 
     @classmethod
-    def _default_summary(cls, array: awkward.Array) -> str:
+    def _default_summary(cls, stats: "ArrayStats") -> str:
         # Default behavior for continuous arrays
-        num = awkward.count(array, axis=None)
-        min = awkward.min(array, axis=None)
-        max = awkward.max(array, axis=None)
-        mean = numpy.mean(awkward.flatten(array, axis=None))
-        std = numpy.std(awkward.flatten(array, axis=None))
-        return "\n".join(
-            [
-                f"Entries:  {num}",
-                f"min/max:  {min}/{max}",
-                f"mean   :  {mean}",
-                f"stddev :  {std}",
-            ]
-        )
+        lines = [
+            f"Entries:  {stats.count}",
+            f"min/max:  {stats.min}/{stats.max}",
+            f"mean   :  {stats.mean}",
+            f"stddev :  {stats.std}",
+        ]
+        # Quantiles are approximate, and missing from older cached summaries
+        if stats.median is not None:
+            lines.append(f"median :  {stats.median:.6g} (approx.)")
+            lines.append(f"IQR    :  {stats.iqr:.6g} [{stats.q1:.6g}, {stats.q3:.6g}]")
+        if stats.underflow or stats.overflow:
+            lines.append(f"under/overflow: {stats.underflow}/{stats.overflow}")
+        if stats.hist_approximate:
+            lines.append("histogram: approx. counts (streamed)")
+        return "\n".join(lines)
@@ -1,36 +1,89 @@
+import os
+from typing import TYPE_CHECKING, List, Optional
+
 import textual
 import textual.app
 import textual.containers
 import textual.screen
+import textual.timer
 import textual.widgets
+import textual.worker
+
+from ..column_cache import format_size
+
+if TYPE_CHECKING:
+    from ..file_scan import TreeInfo
+
+
+class LoadProgress(textual.widgets.ProgressBar):
+    """Progress of the background reads, the border title shows what is read"""
+
+    DEFAULT_CSS = """
+    LoadProgress Bar {
+        width: 1fr;
+    }
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, show_eta=False, **kwargs)
+        self.styles.border = ("solid", "gray")
+        self.styles.height = 3
+        self.border_title = "Idle"
+
+    def update_progress(self, label: str, done: float, total: float | None):
+        self.border_title = label
+        self.update(total=total, progress=done)
 
 
 class DisplayCurrentFile(textual.containers.HorizontalGroup):
     """Always on items that is used to display the opened files"""
 
     def __init__(self, file_path: str, tree_path: str, *args, **kwargs):
+        self.file_path = file_path
+        self.tree_path = tree_path
         self.display_filename = textual.widgets.Static(str(file_path))
         self.display_treepath = textual.widgets.Static(str(tree_path))
-        super().__init__(self.display_filename, self.display_treepath)
+        self.load_progress = LoadProgress()
+        self.display_cache = textual.widgets.Static("")
+        super().__init__(
+            self.display_filename,
+            self.display_treepath,
+            self.load_progress,
+            self.display_cache,
+        )
 
         # Common styling items
-        for comp in [self.display_filename, self.display_treepath]:
+        for comp in [self.display_filename, self.display_treepath, self.display_cache]:
             comp.styles.border = ("solid", "gray")
             comp.styles.height = 3
             comp.can_focus = False
 
         # Distinct styling
         self.display_filename.border_title = "File path:"
-        self.display_filename.styles.width = "60%"
+        self.display_filename.styles.width = "35%"
         self.display_treepath.border_title = "Tree path:"
-        self.display_treepath.styles.width = "40%"
+        self.display_treepath.styles.width = "15%"
+        self.load_progress.styles.width = "25%"
+        self.display_cache.border_title = "Column cache:"
+        self.display_cache.styles.width = "25%"
 
     def update_paths(self, file_path: str | None, tree_path: str | None):
+        self.file_path = file_path
+        self.tree_path = tree_path
         self.display_filename.update(str(file_path))
         self.display_treepath.update(str(tree_path))
 
+    def update_progress(self, label: str, done: float, total: float | None):
+        self.load_progress.update_progress(label, done, total)
+
+    def update_cache(self, summary: str):
+        self.display_cache.update(summary)
+
 
 class FilePicker(textual.screen.ModalScreen):
+    # Seconds without typing before the file path is scanned for trees
+    scan_delay = 0.3
+
     BINDINGS = [
         textual.app.Binding("ctrl+b", "cancel", "Exiting without opening new file"),
         textual.app.Binding("ctrl+o", "open_file", "Open new file"),
@@ -38,8 +91,8 @@ class FilePicker(textual.screen.ModalScreen):
 
     def __init__(self, current_display: DisplayCurrentFile, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.file_input = textual.widgets.Input(current_display.display_filename._content)
-        self.tree_input = textual.widgets.Input(current_display.display_treepath._content)
+        self.file_input = textual.widgets.Input(current_display.file_path or "")
+        self.tree_input = textual.widgets.Input(current_display.tree_path or "")
 
         self.open_button = textual.widgets.Button(
             "[O]pen array", variant="primary", id="open"
@@ -65,6 +118,53 @@ class FilePicker(textual.screen.ModalScreen):
         self._container.styles.max_width = "80%"
         self.open_button.styles.width = "50%"
         self.cancel_button.styles.width = "50%"
+        self._scan_timer: Optional[textual.timer.Timer] = None
+
+    def on_input_changed(self, event: textual.widgets.Input.Changed) -> None:
+        # De-bouncing: partially typed paths and URLs are never opened
+        if event.input is not self.file_input:
+            return
+        if self._scan_timer is not None:
+            self._scan_timer.stop()
+        value = event.value
+        self._scan_timer = self.set_timer(
+            self.scan_delay, lambda: self._scan_worker(value)
+        )
+
+    @textual.work(thread=True, exclusive=True, group="scan", exit_on_error=False)
+    def _scan_worker(self, file_path: str) -> None:
+        # Listing the trees of the file from the metadata, to fill the tree path
+        from ..file_scan import pick_tree
+        from ..readers import is_url, open_reader
+
+        worker = textual.worker.get_current_worker()
+        if not is_url(file_path) and not os.path.isfile(file_path):
+            self.app.call_from_thread(self._show_trees, [], None)
+            return
+        try:
+            with open_reader(file_path) as reader:
+                trees = reader.scan()
+        except Exception:  # Not a readable file (yet), nothing to suggest
+            trees = []
+        if not worker.is_cancelled:
+            picked = pick_tree(trees)
+            self.app.call_from_thread(self._show_trees, trees, picked)
+
+    @classmethod
+    def _describe(cls, tree: "TreeInfo") -> str:
+        details = [tree.kind, f"{tree.num_entries} entries"]
+        if tree.compressed_bytes is not None:
+            details.append(format_size(tree.compressed_bytes))
+        return f"{tree.path} ({', '.join(details)})"
+
+    def _show_trees(
+        self, trees: List["TreeInfo"], picked: Optional["TreeInfo"]
+    ) -> None:
+        paths = [t.path for t in trees]
+        self.tree_input.border_subtitle = ", ".join(self._describe(t) for t in trees)
+        # Keeping a valid tree path that was already entered
+        if picked is not None and self.tree_input.value not in paths:
+            self.tree_input.value = picked.path
 
     def on_button_pressed(self, event: textual.widgets.Button.Pressed) -> None:
         if event.button.id == "open":
@@ -0,0 +1,54 @@
+import rich.table
+import textual
+import textual.timer
+import textual.widgets
+
+from ..column_cache import format_size
+from ..instrument import Recorder
+
+
+class PerformancePanel(textual.widgets.Static):
+    """
+    Floating table of the time spent in each instrumented section. Hidden by
+    default, the contents are only refreshed while the panel is shown.
+    """
+
+    def __init__(self, recorder: Recorder, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorder = recorder
+        self.can_focus = False
+        self.border_title = "Performance"
+        self.styles.border = ("solid", "green")
+        self.styles.background = "black"
+        self.styles.position = "absolute"
+        self.styles.offset = (2, 4)
+        self.styles.width = 72
+        self.styles.height = "auto"
+        self.styles.display = "none"
+        self._timer: textual.timer.Timer | None = None
+
+    def toggle(self):
+        shown = self.styles.display == "none"
+        self.styles.display = "block" if shown else "none"
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if shown:
+            self.refresh_table()
+            self._timer = self.set_interval(1.0, self.refresh_table)
+
+    def refresh_table(self):
+        table = rich.table.Table(box=None, expand=True)
+        for column in ["span", "calls", "total", "mean", "max", "bytes", "alloc"]:
+            table.add_column(column, justify="left" if column == "span" else "right")
+        for row in self.recorder.table():
+            table.add_row(
+                row["name"],
+                str(row["count"]),
+                f"{row['seconds'] * 1e3:.1f}ms",
+                f"{row['seconds'] / row['count'] * 1e3:.2f}ms",
+                f"{row['max'] * 1e3:.1f}ms",
+                format_size(row["bytes"]),
+                format_size(row["allocated"]) if row["allocated"] else "-",
+            )
+        self.update(table)
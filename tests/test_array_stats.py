@@ -0,0 +1,237 @@
+import awkward
+import numpy
+import pytest
+
+from uproot_browser.array_parse import ArraySummaryType, detect_summary_type
+from uproot_browser.array_stats import (
+    _MAX_BINCOUNT_SPAN,
+    ArrayStats,
+    StatsAccumulator,
+    _AdaptiveHistogram,
+    _QuantileSketch,
+)
+
+
+def test_integer_counts():
+    accumulator = StatsAccumulator()
+    accumulator.update_flat(numpy.array([3, 3, 5, 7, -2]))
+    accumulator.update_flat(numpy.array([10, 3]))
+    stats = accumulator.finalize()
+    assert stats.summary_type is ArraySummaryType.discrete
+    numpy.testing.assert_array_equal(stats.unique, [-2, 3, 5, 7, 10])
+    numpy.testing.assert_array_equal(stats.unique_counts, [1, 3, 1, 1, 1])
+
+
+@pytest.mark.parametrize("dtype", [numpy.int64, numpy.uint64])
+def test_wide_integer_span_is_not_counted(dtype):
+    # Event numbers: the span is far too wide for a dense count array
+    values = numpy.array([1, 2**62, 5], dtype=dtype)
+    accumulator = StatsAccumulator()
+    accumulator.update_flat(values)
+    assert accumulator._int_counts is None
+    stats = accumulator.finalize()
+    assert stats.summary_type is ArraySummaryType.continuous
+    assert stats.count == 3
+
+
+def test_large_uint64_narrow_span():
+    # Values above 2**63 do not fit the int64 offsets of the counts
+    values = numpy.array([2**63 + 5, 2**63 + 9, 2**63 + 5], dtype=numpy.uint64)
+    stats = StatsAccumulator()
+    stats.update_flat(values)
+    stats = stats.finalize()
+    assert stats.summary_type is ArraySummaryType.discrete
+    assert stats.unique.dtype == numpy.uint64
+    assert stats.unique.tolist() == [2**63 + 5, 2**63 + 9]
+    assert stats.unique_counts.tolist() == [2, 1]
+
+
+def test_integer_span_across_chunks():
+    # Each chunk is narrow, but the chunks together are too wide
+    accumulator = StatsAccumulator()
+    accumulator.update_flat(numpy.array([0, 1, 2]))
+    accumulator.update_flat(numpy.array([_MAX_BINCOUNT_SPAN + 10]))
+    assert accumulator._int_counts is None
+
+
+@pytest.fixture
+def rng():
+    return numpy.random.default_rng(1234)
+
+
+def _rank_error(sketch, values, fractions):
+    # Largest difference between the requested and the true rank fractions
+    estimates = sketch.quantiles(fractions)
+    ranks = numpy.searchsorted(numpy.sort(values), estimates) / len(values)
+    return numpy.abs(ranks - numpy.asarray(fractions)).max()
+
+
+FRACTIONS = [0.001, 0.1, 0.25, 0.5, 0.75, 0.9, 0.999]
+
+
+def test_sketch_small_input_is_exact(rng):
+    values = rng.normal(size=1000)
+    sketch = _QuantileSketch()
+    sketch.fill(values)
+    assert sketch.count == 1000
+    ordered = numpy.sort(values)
+    expected = ordered[numpy.ceil(numpy.asarray(FRACTIONS) * 1000).astype(int) - 1]
+    numpy.testing.assert_array_equal(sketch.quantiles(FRACTIONS), expected)
+
+
+@pytest.mark.parametrize("n_chunks", [1, 7, 100])
+def test_sketch_quantiles_match_numpy(rng, n_chunks):
+    values = rng.lognormal(size=1_000_000)
+    sketch = _QuantileSketch()
+    for chunk in numpy.array_split(values, n_chunks):
+        sketch.fill(chunk)
+    assert sketch.count == len(values)
+    assert _rank_error(sketch, values, FRACTIONS) < 0.002
+    # The memory is bounded by a few times k, not by the input
+    assert sum(len(level) for level in sketch.levels) < 4 * sketch.k
+
+
+def test_sketch_merge(rng):
+    values = rng.normal(size=500_000)
+    merged = _QuantileSketch()
+    for part in numpy.array_split(values, 8):
+        sketch = _QuantileSketch()
+        sketch.fill(part)
+        merged.merge(sketch)
+    assert merged.count == len(values)
+    assert _rank_error(merged, values, FRACTIONS) < 0.002
+
+
+def test_sketch_counts_match_values(rng):
+    values = rng.poisson(20, size=200_000)
+    unique, counts = numpy.unique(values, return_counts=True)
+    sketch = _QuantileSketch()
+    sketch.fill_counts(unique, counts)
+    assert sketch.count == len(values)
+    numpy.testing.assert_allclose(
+        sketch.quantiles([0.25, 0.5, 0.75]), numpy.quantile(values, [0.25, 0.5, 0.75])
+    )
+
+
+def test_sketch_ranks(rng):
+    values = rng.uniform(size=100_000)
+    sketch = _QuantileSketch()
+    sketch.fill(values)
+    points = numpy.array([0.1, 0.5, 0.9])
+    expected = numpy.searchsorted(numpy.sort(values), points)
+    numpy.testing.assert_allclose(sketch.ranks(points), expected, rtol=0.02)
+
+
+def test_histogram_fill_matches_numpy(rng):
+    values = rng.normal(size=100_000)
+    hist = _AdaptiveHistogram(max_bins=64)
+    for chunk in numpy.array_split(values, 10):
+        hist.fill(chunk)
+    assert len(hist.counts) <= 64
+    edges = (hist.low + numpy.arange(len(hist.counts) + 1)) * hist.width
+    expected, _ = numpy.histogram(values, bins=edges)
+    numpy.testing.assert_array_equal(hist.counts, expected)
+
+
+def test_histogram_merge_matches_single_fill(rng):
+    # The parts have different ranges, and so different bin widths
+    parts = [rng.normal(0, 1, 50_000), rng.normal(30, 5, 50_000), rng.uniform(size=10)]
+    merged = _AdaptiveHistogram(max_bins=128)
+    for part in parts:
+        hist = _AdaptiveHistogram(max_bins=128)
+        hist.fill(part)
+        merged.merge(hist)
+    values = numpy.concatenate(parts)
+    assert merged.counts.sum() == len(values)
+    edges = (merged.low + numpy.arange(len(merged.counts) + 1)) * merged.width
+    expected, _ = numpy.histogram(values, bins=edges)
+    numpy.testing.assert_array_equal(merged.counts, expected)
+
+
+def test_moments_merge(rng):
+    values = rng.normal(1e6, 3, size=300_000)
+    merged = StatsAccumulator()
+    for part in numpy.array_split(values, 7):
+        accumulator = StatsAccumulator()
+        accumulator.update_flat(part)
+        merged.merge(accumulator)
+    stats = merged.finalize()
+    assert stats.count == len(values)
+    assert stats.min == values.min() and stats.max == values.max()
+    numpy.testing.assert_allclose(stats.mean, values.mean(), rtol=1e-12)
+    numpy.testing.assert_allclose(stats.std, values.std(), rtol=1e-9)
+
+
+def test_integer_quantiles_from_counts(rng):
+    values = rng.poisson(50, size=100_000)
+    accumulator = StatsAccumulator()
+    accumulator.update_flat(values)
+    stats = accumulator.finalize()
+    assert stats.summary_type is ArraySummaryType.continuous
+    # Counted integers are never sorted into the sketch
+    assert accumulator.sketch.count == 0
+    expected = numpy.quantile(values, [0.25, 0.5, 0.75], method="inverted_cdf")
+    assert [stats.q1, stats.median, stats.q3] == list(expected)
+    assert stats.hist_counts.sum() + stats.underflow + stats.overflow == len(values)
+
+
+def test_dropped_integer_counts_move_to_sketch(rng):
+    values = rng.poisson(50, size=100_000)
+    accumulator = StatsAccumulator()
+    accumulator.update_flat(values[:50_000])
+    accumulator.update_flat(numpy.array([2**40]))
+    accumulator.update_flat(values[50_000:])
+    assert accumulator._int_counts is None
+    assert accumulator.sketch.count == len(values) + 1
+    stats = accumulator.finalize()
+    numpy.testing.assert_allclose(stats.median, numpy.median(values), atol=1)
+
+
+def test_outlier_histogram_exact_in_memory(rng):
+    # A few huge outliers: the adaptive bins are far coarser than the bulk,
+    # the histogram of an in-memory array is binned exactly nonetheless
+    values = rng.normal(10, 2, 200_000)
+    values[::10_000] = 1e30
+    stats = ArrayStats.from_array(awkward.Array(values))
+    assert not stats.hist_approximate
+    width = stats.hist_centers[1] - stats.hist_centers[0]
+    low, high = stats.hist_centers[0] - width / 2, stats.hist_centers[-1] + width / 2
+    expected, _ = numpy.histogram(
+        values, bins=len(stats.hist_counts), range=(low, high)
+    )
+    # The edges fall on values, and are only known up to rounding here
+    numpy.testing.assert_allclose(stats.hist_counts, expected, atol=1)
+    assert abs(stats.underflow - numpy.count_nonzero(values < low)) <= 1
+    assert abs(stats.overflow - numpy.count_nonzero(values > high)) <= 1
+    assert stats.hist_counts.sum() + stats.underflow + stats.overflow == len(values)
+
+
+def test_outlier_histogram_streamed_is_approximate(rng):
+    values = rng.normal(10, 2, 200_000)
+    values[::10_000] = 1e30
+    accumulator = StatsAccumulator()
+    for chunk in numpy.array_split(values, 10):
+        accumulator.update_flat(chunk)
+    stats = accumulator.finalize()
+    assert stats.hist_approximate
+    assert ArrayStats.from_dict(stats.to_dict()).hist_approximate
+    total = stats.hist_counts.sum() + stats.underflow + stats.overflow
+    assert total == len(values)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [True, False],
+        [1.5, 2.0],
+        [[1, 2], [3]],
+        list(range(100)),
+        [1, 5, 9],
+        numpy.array([], dtype=numpy.int32),
+    ],
+)
+def test_detect_summary_type(values):
+    # Same classification as the statistics shown by the widgets
+    array = awkward.Array(values)
+    expected = ArrayStats.from_array(array).summary_type
+    assert detect_summary_type(array) is expected
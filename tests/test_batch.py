@@ -0,0 +1,47 @@
+import json
+
+import numpy
+import pytest
+import uproot
+
+from uproot_browser import batch
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    path = str(tmp_path / "events.root")
+    with uproot.recreate(path) as f:
+        f.mktree("Events", {"x": "float64", "n": "int32", "flag": "bool"})
+        f["Events"].extend(
+            {
+                "x": numpy.linspace(0, 1, 1000),
+                "n": numpy.arange(1000, dtype=numpy.int32) % 5,
+                "flag": numpy.arange(1000) % 2 == 0,
+            }
+        )
+    return path
+
+
+def test_run_batch(tree_file):
+    result = batch.run_batch(tree_file, None, chunk_size=300)
+    assert result["tree"] == "Events"
+    assert [r["branch"] for r in result["branches"]] == ["x", "n", "flag"]
+    assert all("error" not in r for r in result["branches"])
+
+    # Every branch holds the same events, they are counted once
+    rate = result["throughput"]
+    assert rate["entries"] == 1000
+    assert rate["events_per_second"] == pytest.approx(1000 / rate["seconds"])
+
+
+def test_zero_duration(tree_file, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(batch.time, "perf_counter", lambda: 0.0)
+    output = str(tmp_path / "summary.json")
+    assert batch.main_batch(tree_file, "Events", output, 1, 300) == 0
+
+    with open(output) as f:
+        rate = json.load(f)["throughput"]
+    assert rate["seconds"] == 0
+    assert rate["events_per_second"] is None
+    assert rate["mb_per_second"] is None
+    assert "n/a events/s, n/a MB/s" in capsys.readouterr().err
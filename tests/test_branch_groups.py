@@ -0,0 +1,76 @@
+from uproot_browser.branch_groups import BranchGroup, group_branches
+
+KEYS = [
+    "run",
+    "event",
+    "nJet",
+    "Jet_pt",
+    "Jet_eta",
+    "Jet_phi",
+    "Muon_pt",
+    "Muon_eta",
+    "HLT_IsoMu24",
+    "HLT_IsoMu24_eta2p1",
+    "HLT_IsoMu27",
+    "HLT_Ele32",
+    "evt/evt.fX",
+    "evt/evt.fY",
+    "evt/evt.fZ",
+]
+
+
+def _labels(entries):
+    return [e.label if isinstance(e, BranchGroup) else e for e in entries]
+
+
+def test_group_branches():
+    root = group_branches(KEYS)
+    # Prefixes of fewer than three branches stay flat, in the order of the tree
+    assert _labels(root.entries) == [
+        "run",
+        "event",
+        "nJet",
+        "Jet",
+        "Muon_pt",
+        "Muon_eta",
+        "HLT",
+        "evt",
+    ]
+    assert root.find("Jet").entries == ["Jet_pt", "Jet_eta", "Jet_phi"]
+    assert root.find("HLT").entries == KEYS[8:12]
+    # Members of split objects are named as accepted by the columns
+    assert root.find("evt").names == ["evt.fX", "evt.fY", "evt.fZ"]
+    assert len(root) == len(KEYS)
+
+
+def test_single_sub_group_replaces_parent():
+    root = group_branches(["HLT_IsoMu24_a", "HLT_IsoMu24_b", "HLT_IsoMu24_c", "x"])
+    assert _labels(root.entries) == ["HLT_IsoMu24", "x"]
+    assert root.find("HLT") is None
+
+
+def test_nested_groups():
+    keys = ["Jet_pt", "Jet_eta", "Jet_btag_A", "Jet_btag_B", "Jet_btag_C"]
+    root = group_branches(keys)
+    jet = root.find("jet_")
+    assert root.find("Jet") is jet
+    assert _labels(jet.entries) == ["Jet_pt", "Jet_eta", "Jet_btag"]
+    assert jet.find("Jet_btag").entries == keys[2:]
+    assert jet.names == keys
+    assert list(root.groups()) == [jet, jet.find("Jet_btag")]
+
+
+def test_rows():
+    root = group_branches(KEYS)
+    # Collapsed groups are a single row each
+    assert len(root.rows()) == len(root.entries)
+    jet = root.find("Jet")
+    jet.expanded = True
+    rows = root.rows()
+    position = rows.index((0, jet))
+    assert rows[position + 1 : position + 4] == [
+        (1, "Jet_pt"),
+        (1, "Jet_eta"),
+        (1, "Jet_phi"),
+    ]
+    assert len(rows) == len(root.entries) + 3
@@ -0,0 +1,126 @@
+import threading
+
+import numpy
+import pytest
+
+from uproot_browser.column_cache import ColumnCache, format_size, parse_size
+
+
+def _array(nbytes: int) -> numpy.ndarray:
+    return numpy.zeros(nbytes, dtype=numpy.uint8)
+
+
+def test_parse_size():
+    assert parse_size("4GB") == 4 * 10**9
+    assert parse_size("512MiB") == 512 * 1024**2
+    assert parse_size("1e9") == 10**9
+    assert format_size(1500) == "1.5kB"
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_eviction_order():
+    cache = ColumnCache(300)
+    for key in "abc":
+        cache.put(key, _array(100))
+    # Using "a" makes "b" the least recently used
+    assert cache.get("a", lambda: pytest.fail("computed a stored item")) is not None
+    cache.put("d", _array(100))
+    assert "b" not in cache
+    assert {"a", "c", "d"} == {k for k in "abcd" if k in cache}
+    assert cache.nbytes == 300
+    assert cache.evictions == 1
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_peek_and_fits():
+    cache = ColumnCache(300)
+    cache.put("a", _array(100))
+    cache.put("b", _array(100))
+    # Peeking does not count as a use, so "a" is still evicted first
+    assert cache.peek("a") is not None
+    assert cache.peek("missing") is None
+    assert cache.fits(100)
+    assert not cache.fits(101)
+    cache.put("c", _array(200))
+    assert "a" not in cache
+    assert "b" in cache
+
+
+def test_larger_than_budget():
+    cache = ColumnCache(100)
+    cache.put("a", _array(50))
+    assert len(cache.get("big", lambda: _array(200))) == 200
+    assert "big" not in cache
+    assert "a" in cache
+
+
+def test_unbounded():
+    cache = ColumnCache(None)
+    for i in range(10):
+        cache.put(i, _array(10**6))
+    assert len(cache) == 10
+    assert cache.fits(10**12)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_in_flight_computed_once():
+    cache = ColumnCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(threading.current_thread().name)
+        started.set()
+        release.wait()
+        return _array(10)
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get("x", compute)))
+    first.start()
+    started.wait()
+    # The second lookup waits for the read in flight instead of reading again
+    second = threading.Thread(target=lambda: results.append(cache.get("x", compute)))
+    second.start()
+    release.set()
+    first.join()
+    second.join()
+    assert len(calls) == 1
+    assert results[0] is results[1]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_in_flight_failure_recomputed():
+    cache = ColumnCache()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait()
+        raise RuntimeError("cancelled")
+
+    errors = []
+
+    def first():
+        try:
+            cache.get("x", failing)
+        except RuntimeError as err:
+            errors.append(err)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    started.wait()
+    results = []
+    waiting = threading.Thread(
+        target=lambda: results.append(cache.get("x", lambda: _array(5)))
+    )
+    waiting.start()
+    release.set()
+    thread.join()
+    waiting.join()
+    # The waiting lookup computes the item itself once the first one failed
+    assert len(errors) == 1
+    assert len(results[0]) == 5
+    assert "x" in cache
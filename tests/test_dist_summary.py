@@ -0,0 +1,20 @@
+import awkward
+import numpy
+
+from uproot_browser.array_stats import ArrayStats
+from uproot_browser.widgets.dist_summary import DistributionSummary
+
+
+def test_boolean_summary():
+    stats = ArrayStats.from_array(awkward.Array(numpy.array([True, False, True, True])))
+    text = DistributionSummary._boolean_summary(stats)
+    assert "True/False :  3/1" in text
+    assert "Ratio (T/F):  0.75/0.25" in text
+
+
+def test_empty_boolean_summary():
+    # An empty selection, such as array.b[array.x > 100]
+    stats = ArrayStats.from_array(awkward.Array(numpy.array([], dtype=bool)))
+    text = DistributionSummary._boolean_summary(stats)
+    assert "Entries    :  0" in text
+    assert "Ratio (T/F):  nan/nan" in text
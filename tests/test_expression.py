@@ -0,0 +1,78 @@
+import awkward
+import numpy
+import pytest
+
+from uproot_browser.column_cache import ColumnCache
+from uproot_browser.expression import evaluate, parse
+
+
+class _Columns:
+    """Columns counting the branch lookups"""
+
+    def __init__(self, **columns):
+        self.columns = {k: awkward.Array(v) for k, v in columns.items()}
+        self.lookups = []
+
+    def __getitem__(self, name):
+        self.lookups.append(name)
+        return self.columns[name]
+
+    def __getattr__(self, name):
+        if name == "columns":
+            raise AttributeError(name)
+        return self[name]
+
+
+def test_keys():
+    # Both spellings of a branch lookup and the spacing share a key
+    assert parse("array.x").key == parse("array['x']").key
+    assert parse("array.x*2").key == parse(" array['x'] * 2 ").key
+    assert parse("array.x * 2").key != parse("array.x * 3").key
+    assert parse("array.x").key != parse("array.y").key
+
+
+def test_branches():
+    parsed = parse("np.sqrt(array.px**2 + array['py']**2) + array.px")
+    assert parsed.branches == ["px", "py"]
+    assert parsed.branch is None
+    assert parse("array.Jet_pt").branch == "Jet_pt"
+    assert parse("array['Muon.pt']").branch == "Muon.pt"
+
+
+def test_parse_cached():
+    assert parse("array.x + 1") is parse("array.x + 1")
+
+
+def test_syntax_error():
+    with pytest.raises(SyntaxError):
+        parse("array.x +")
+
+
+def test_evaluate():
+    columns = _Columns(x=[1.0, 4.0, 9.0])
+    result = evaluate("np.sqrt(array.x) * 2", columns)
+    assert result.to_list() == [2.0, 4.0, 6.0]
+
+
+def test_memo_reuse():
+    columns = _Columns(x=numpy.arange(5.0), y=numpy.ones(5))
+    memo = ColumnCache()
+    first = evaluate("array.x * 2", columns, memo)
+    assert columns.lookups == ["x"]
+
+    # The same definition is taken from the memo, without any lookup
+    assert evaluate("array['x']*2", columns, memo) is first
+    assert columns.lookups == ["x"]
+
+    # Shared sub-expressions are reused by other definitions
+    result = evaluate("array.x * 2 + array.y", columns, memo)
+    assert result.to_list() == (numpy.arange(5.0) * 2 + 1).tolist()
+    assert columns.lookups == ["x", "y"]
+
+
+def test_memo_skips_scopes():
+    # Variables of comprehensions are not memoized, they change per iteration
+    columns = _Columns(x=[1, 2, 3])
+    memo = ColumnCache()
+    assert evaluate("[v * 2 for v in array.x.to_list()]", columns, memo) == [2, 4, 6]
+    assert evaluate("[v * 3 for v in array.x.to_list()]", columns, memo) == [3, 6, 9]
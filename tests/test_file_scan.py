@@ -0,0 +1,69 @@
+import numpy
+import pytest
+import uproot
+
+from uproot_browser.file_scan import pick_tree, scan_file
+from uproot_browser.readers import open_reader
+
+
+@pytest.fixture
+def root_file(tmp_path):
+    path = str(tmp_path / "trees.root")
+    with uproot.recreate(path) as file:
+        small = file.mktree("small", {"a": numpy.int32})
+        small.extend({"a": numpy.arange(10, dtype=numpy.int32)})
+        events = file.mktree("sub/events", {"x": numpy.float64, "n": numpy.int64})
+        events.extend({"x": numpy.linspace(0, 1, 1000), "n": numpy.arange(1000)})
+    return path
+
+
+def test_scan_file(root_file):
+    with uproot.open(root_file) as file:
+        trees = scan_file(file)
+    by_path = {t.path: t for t in trees}
+    assert set(by_path) == {"small", "sub/events"}
+    events = by_path["sub/events"]
+    assert events.kind == "TTree"
+    assert events.num_entries == 1000
+    assert set(events.branches) == {"x", "n"}
+    assert events.branches["x"].typename == "double"
+    assert events.uncompressed_bytes > by_path["small"].uncompressed_bytes
+
+
+def test_pick_tree(root_file):
+    with uproot.open(root_file) as file:
+        trees = scan_file(file)
+    # The tree with the most data without a preferred path, also when the
+    # path is left empty in the file picker
+    assert pick_tree(trees).path == "sub/events"
+    assert pick_tree(trees, "").path == "sub/events"
+    assert pick_tree(trees, "small").path == "small"
+    assert pick_tree(trees, "/sub/events;1").path == "sub/events"
+    assert pick_tree(trees, "missing") is None
+    assert pick_tree([]) is None
+
+
+def test_reader_close(root_file):
+    with open_reader(root_file) as reader:
+        assert {t.path for t in reader.scan()} == {"small", "sub/events"}
+    assert reader.uproot_file.closed
+
+
+def test_scan_rntuple(tmp_path):
+    path = str(tmp_path / "rntuple.root")
+    x = numpy.linspace(0, 1, 500)
+    with uproot.recreate(path) as file:
+        file.mkrntuple("ntuple", {"x": x, "n": numpy.arange(500, dtype=numpy.int32)})
+
+    with open_reader(path) as reader:
+        (info,) = reader.scan()
+        assert info.kind == "RNTuple"
+        assert info.num_entries == 500
+        assert set(info.branches) == {"x", "n"}
+        # Sizes are summed from the page lists of the footer
+        assert info.branches["x"].uncompressed_bytes == x.nbytes
+        assert pick_tree([info]) is info
+
+        tree = reader.tree("ntuple")
+        assert tree.entry_offsets[-1] == 500
+        assert tree["x"].array(100, 200).to_list() == x[100:200].tolist()
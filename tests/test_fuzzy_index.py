@@ -0,0 +1,49 @@
+import pytest
+
+from uproot_browser.fuzzy_index import FuzzyIndex
+
+NAMES = [
+    "Jet_pt",
+    "Jet_eta",
+    "Jet_phi",
+    "nJet",
+    "Muon_pt",
+    "Muon_eta",
+    "MET_pt",
+    "HLT_IsoMu24",
+    "PV_npvs",
+    "event",
+]
+
+
+def test_ranking():
+    index = FuzzyIndex(NAMES)
+    # Shortest span first, then earliest match, then the name
+    assert index.match("pt") == ["Jet_pt", "MET_pt", "Muon_pt"]
+    assert index.match("jet") == ["Jet_eta", "Jet_phi", "Jet_pt", "nJet"]
+    assert index.match("mu") == ["Muon_eta", "Muon_pt", "HLT_IsoMu24"]
+
+
+def test_case_and_empty():
+    index = FuzzyIndex(NAMES)
+    assert index.match("MUON") == index.match("muon")
+    assert index.match("") == NAMES
+    assert index.match("xyz") == []
+
+
+def test_incremental():
+    index = FuzzyIndex(NAMES)
+    # Narrowing a query only re-tests the previous matches, widening it again
+    # starts from all names
+    for query in ["j", "je", "jet", "jet_", "jet_p"]:
+        assert index.match(query) == FuzzyIndex(NAMES).match(query)
+    assert index.match("m") == FuzzyIndex(NAMES).match("m")
+    assert index.match("") == NAMES
+    assert index.match("e") == FuzzyIndex(NAMES).match("e")
+
+
+def test_same_as_fuzzyfinder():
+    fuzzyfinder = pytest.importorskip("fuzzyfinder")
+    index = FuzzyIndex(NAMES)
+    for query in ["pt", "jt", "mu", "e", "nj", "hlt", "ta"]:
+        assert index.match(query) == list(fuzzyfinder.fuzzyfinder(query, NAMES))
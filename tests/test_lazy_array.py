@@ -0,0 +1,56 @@
+import numpy
+import pytest
+import uproot
+
+from uproot_browser.column_cache import ColumnCache
+from uproot_browser.expression import evaluate
+from uproot_browser.lazy_array import LazyColumns
+
+
+@pytest.fixture
+def tree(tmp_path):
+    path = str(tmp_path / "tree.root")
+    with uproot.recreate(path) as file:
+        events = file.mktree("Events", {"x": numpy.float64, "y": numpy.float64})
+        events.extend({"x": numpy.arange(1000.0), "y": numpy.ones(1000)})
+    with uproot.open(path) as file:
+        yield file["Events"]
+
+
+def _count_reads(columns, monkeypatch):
+    reads = []
+    read_branch = columns._read_branch
+
+    def counting(name):
+        reads.append(name)
+        return read_branch(name)
+
+    monkeypatch.setattr(columns, "_read_branch", counting)
+    return reads
+
+
+def test_cached_reads(tree, monkeypatch):
+    columns = LazyColumns(tree, ColumnCache())
+    reads = _count_reads(columns, monkeypatch)
+    assert columns["x"].to_list() == list(range(1000))
+    columns.x
+    assert reads == ["x"]
+    assert columns.is_loaded("x")
+    assert not columns.is_loaded("y")
+
+
+def test_pinned_beyond_budget(tree, monkeypatch):
+    # The columns are larger than the whole budget, and never cached
+    cache = ColumnCache(100)
+    columns = LazyColumns(tree, cache)
+    reads = _count_reads(columns, monkeypatch)
+    view = columns.pinned(["x", "y", "missing"])
+    assert reads == ["x", "y"]
+    assert not columns.is_loaded("x")
+
+    result = evaluate("array.x + array['y']", view, cache)
+    assert result.to_list() == [v + 1 for v in range(1000)]
+    assert reads == ["x", "y"]
+    # The parent is not affected by the view
+    columns["x"]
+    assert reads == ["x", "y", "x"]
@@ -0,0 +1,70 @@
+import numpy
+import pytest
+
+from uproot_browser.readers import ArrowTable, FileReader, open_reader
+
+pyarrow = pytest.importorskip("pyarrow")
+feather = pytest.importorskip("pyarrow.feather")
+
+
+@pytest.mark.parametrize("compression", ["uncompressed", "zstd"])
+def test_ipc_table(tmp_path, compression):
+    path = str(tmp_path / "table.feather")
+    x = numpy.arange(1000, dtype=numpy.float64)
+    table = pyarrow.table({"x": x, "n": numpy.arange(1000) % 7})
+    feather.write_feather(table, path, compression=compression, chunksize=300)
+
+    with open_reader(path) as reader:
+        (info,) = reader.scan()
+        tree = reader.tree("table")
+    assert info.kind == "Arrow"
+    assert info.num_entries == 1000
+    assert tree.entry_offsets == [0, 300, 600, 900, 1000]
+    assert info.branches["x"].uncompressed_bytes == x.nbytes
+
+    # Ranges spanning several record batches, and empty ones
+    column = tree["x"]
+    assert column.array(250, 650).to_list() == x[250:650].tolist()
+    assert column.array(950).to_list() == x[950:].tolist()
+    assert len(column.array(5, 5)) == 0
+
+
+def test_abstract_bases():
+    with pytest.raises(TypeError):
+        ArrowTable("table.feather")
+    with pytest.raises(TypeError):
+        FileReader("file.root")
+
+
+@pytest.mark.parametrize("compression", ["uncompressed", "zstd"])
+def test_ipc_layout(tmp_path, compression):
+    # The buffers of every column are attributed from the metadata alone,
+    # including nested, dictionary, union and view types
+    path = str(tmp_path / "layout.feather")
+    n = 50
+    table = pyarrow.table(
+        {
+            "s": pyarrow.array([str(i) for i in range(n)]),
+            "l": pyarrow.array([[i] * 3 for i in range(n)]),
+            "st": pyarrow.array([{"a": i, "b": "x"} for i in range(n)]),
+            "d": pyarrow.array(["a", "b"] * (n // 2)).dictionary_encode(),
+            "null": pyarrow.nulls(n),
+            "sv": pyarrow.array([str(i) * 20 for i in range(n)], pyarrow.string_view()),
+            "u": pyarrow.UnionArray.from_sparse(
+                pyarrow.array([0, 1] * (n // 2), pyarrow.int8()),
+                [pyarrow.array(range(n)), pyarrow.array([str(i) for i in range(n)])],
+            ),
+            "tail": numpy.arange(n, dtype=numpy.int32),
+        }
+    )
+    feather.write_feather(table, path, compression=compression, chunksize=20)
+
+    with open_reader(path) as reader:
+        tree = reader.tree("table")
+    assert tree.entry_offsets == [0, 20, 40, 50]
+    sizes = tree.column_sizes()
+    assert sizes["tail"][1] == n * 4
+    assert sizes["null"] == (0, 0)
+    if compression == "uncompressed":
+        assert sizes["sv"][0] == sizes["sv"][1]
+    assert tree["tail"].array(15, 45).to_list() == list(range(15, 45))
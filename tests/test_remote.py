@@ -0,0 +1,68 @@
+import os
+
+import numpy
+import pytest
+import uproot
+from http_server import serve
+
+from uproot_browser.remote import open_url
+
+BRANCHES = ["x", "n", "y"]
+
+
+def _browse(server, url, passes, **options):
+    server.reset()
+    fetched = []
+    with open_url(url, array_cache=None, **options) as f:
+        tree = f["Events"]
+        for _ in range(passes):
+            fetched = [tree[name].array(library="np") for name in BRANCHES]
+    return fetched, server.requests, server.bytes_sent
+
+
+@pytest.fixture(scope="module")
+def served(tmp_path_factory):
+    # Incompressible values over many baskets, and so many uproot requests
+    directory = tmp_path_factory.mktemp("remote")
+    path = directory / "t.root"
+    rng = numpy.random.default_rng(0)
+    with uproot.recreate(path) as f:
+        f.mktree("Events", {"x": "float64", "n": "int32", "y": "float32"})
+        for _ in range(20):
+            f["Events"].extend(
+                {
+                    "x": rng.normal(size=5000),
+                    "n": rng.integers(0, 100, 5000, dtype=numpy.int32),
+                    "y": rng.normal(size=5000).astype(numpy.float32),
+                }
+            )
+    with uproot.open(path) as f:
+        expected = f["Events"].arrays(BRANCHES, library="np")
+
+    server = serve(str(directory))
+    url = f"http://127.0.0.1:{server.server_address[1]}/t.root"
+    # Requests and bytes of the uproot source, reading the branches once and twice
+    handler = uproot.source.http.HTTPSource
+    baseline = [_browse(server, url, passes, handler=handler)[1:] for passes in (1, 2)]
+    yield server, url, expected, os.path.getsize(path), baseline
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("block_size", [4096, 65536])
+def test_cached_source(served, block_size):
+    server, url, expected, file_size, baseline = served
+    (uproot_requests, _), (uproot_requests_again, uproot_bytes_again) = baseline
+
+    fetched, requests, n_bytes = _browse(server, url, 1, http_block_size=block_size)
+    for name, array in zip(BRANCHES, fetched):
+        numpy.testing.assert_array_equal(array, expected[name])
+    assert requests <= uproot_requests
+    # Whole blocks are fetched, but never twice (the probe of the size aside)
+    assert n_bytes <= file_size + 1
+
+    # Browsing the branches again is served from the blocks already fetched
+    _, requests, n_bytes_again = _browse(server, url, 2, http_block_size=block_size)
+    assert n_bytes_again == n_bytes
+    assert requests <= uproot_requests_again
+    assert n_bytes_again <= uproot_bytes_again
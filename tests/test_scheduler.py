@@ -0,0 +1,85 @@
+import pytest
+
+from uproot_browser.scheduler import JobCancelled, PlotScheduler
+
+
+class _App:
+    """Stand-in for the Textual app, with timers fired by hand"""
+
+    def __init__(self):
+        self.timers = []
+
+    def set_timer(self, delay, callback):
+        self.timers.append(callback)
+        return callback
+
+    def call_from_thread(self, callback, *args):
+        callback(*args)
+
+    def fire(self):
+        timers, self.timers = self.timers, []
+        for callback in timers:
+            callback()
+
+
+@pytest.fixture
+def app():
+    return _App()
+
+
+def test_coalesced(app):
+    started = []
+    scheduler = PlotScheduler(app, started.append)
+    first = scheduler.submit("array.x", None)
+    second = scheduler.submit("array.y", None)
+    # Requests within the delay share the timer, only the latest is started
+    assert len(app.timers) == 1
+    app.fire()
+    assert started == [second]
+    assert scheduler.coalesced == 1
+    assert not first.is_current
+    assert second.is_current
+
+
+def test_generation_cancels_running(app):
+    started = []
+    scheduler = PlotScheduler(app, started.append)
+    job = scheduler.submit("array.x", None)
+    app.fire()
+    delivered = []
+    job.call(delivered.append, "first")
+    job.check()
+
+    newer = scheduler.submit("array.y", None)
+    with pytest.raises(JobCancelled):
+        job.check()
+    with pytest.raises(JobCancelled):
+        job.call(delivered.append, "stale")
+    newer.call(delivered.append, "newer")
+    assert delivered == ["first", "newer"]
+
+
+def test_stale_delivery_dropped(app):
+    # A result on its way to the main thread is dropped if superseded meanwhile
+    scheduler = PlotScheduler(app, lambda job: None)
+    job = scheduler.submit("array.x", None)
+    app.fire()
+    delivered = []
+
+    def call_from_thread(callback, *args):
+        scheduler.submit("array.y", None)
+        callback(*args)
+
+    app.call_from_thread = call_from_thread
+    job.call(delivered.append, "stale")
+    assert delivered == []
+
+
+def test_cancel(app):
+    started = []
+    scheduler = PlotScheduler(app, started.append)
+    job = scheduler.submit("array.x", None)
+    scheduler.cancel()
+    app.fire()
+    assert started == []
+    assert not job.is_current
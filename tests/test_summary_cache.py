@@ -0,0 +1,71 @@
+import json
+import os
+
+import awkward
+import numpy
+
+from uproot_browser.array_stats import ArrayStats
+from uproot_browser.summary_cache import SummaryCache
+
+
+def test_key():
+    cache = SummaryCache("unused")
+    key = cache.key("file", "Events", "x")
+    assert key == cache.key("file", "Events", "x")
+    assert key != cache.key("other", "Events", "x")
+    assert key != cache.key("file", "Events", "y")
+    # The parts are separated, such that they cannot be shifted into each other
+    assert cache.key("ab", "c", "x") != cache.key("a", "bc", "x")
+
+
+def test_round_trip(tmp_path):
+    cache = SummaryCache(str(tmp_path / "cache"))
+    values = numpy.random.default_rng(0).normal(size=1000)
+    stats = ArrayStats.from_array(awkward.Array(values))
+    key = cache.key("file", "Events", "x")
+    assert key not in cache
+    assert cache.load(key) is None
+
+    cache.store(key, {"stats": stats.to_dict()})
+    assert key in cache
+    loaded = ArrayStats.from_dict(cache.load(key)["stats"])
+    assert loaded.summary_type == stats.summary_type
+    assert loaded.mean == stats.mean
+    assert loaded.median == stats.median
+    numpy.testing.assert_array_equal(loaded.hist_counts, stats.hist_counts)
+
+
+def test_corrupt_record(tmp_path):
+    cache = SummaryCache(str(tmp_path))
+    key = cache.key("file", "Events", "x")
+    with open(tmp_path / f"{key}.json", "w") as f:
+        f.write("{not json")
+    assert cache.load(key) is None
+
+
+def test_eviction(tmp_path):
+    record = {"values": list(range(100))}
+    size = len(json.dumps(record))
+    cache = SummaryCache(str(tmp_path), max_bytes=3 * size)
+    keys = [cache.key("file", "Events", str(i)) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.store(key, record)
+        # Distinct times of last use, older for the first records
+        os.utime(tmp_path / f"{key}.json", (1000 + i, 1000 + i))
+
+    # Loading marks the oldest record as used, the second one is evicted
+    assert cache.load(keys[0]) == record
+    cache.store(cache.key("file", "Events", "new"), record)
+    assert keys[0] in cache
+    assert keys[1] not in cache
+    assert keys[2] in cache
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def test_unwritable_directory(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    # Failures to store are not fatal
+    cache = SummaryCache(str(blocker / "cache"))
+    cache.store(cache.key("file", "Events", "x"), {})
+    assert cache.load(cache.key("file", "Events", "x")) is None